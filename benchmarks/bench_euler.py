@@ -0,0 +1,69 @@
+"""
+Quaternion -> roll/pitch/yaw: scipy Rotation vs the closed-form helpers in
+``smartbot_irl.data._type_maps``.
+
+Run from the repo root::
+
+    python benchmarks/bench_euler.py
+"""
+
+import timeit
+import warnings
+
+import numpy as np
+from scipy.spatial.transform import Rotation as R
+
+from smartbot_irl.data._type_maps import ArucoMarkers, Pose, quat_to_euler, quats_to_euler
+
+
+def _pose_msg(q):
+    return {
+        'position': {'x': 1.0, 'y': 2.0, 'z': 0.0},
+        'orientation': {'x': q[0], 'y': q[1], 'z': q[2], 'w': q[3]},
+    }
+
+
+def _per_call(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def main():
+    rng = np.random.default_rng(0)
+    q = rng.normal(size=4).tolist()  # rosbridge hands us Python floats.
+    qs = rng.normal(size=(50, 4))
+
+    scipy_one = _per_call(lambda: R.from_quat(np.array(q)).as_euler('xyz'), 20_000)
+    fast_one = _per_call(lambda: quat_to_euler(*q), 20_000)
+    print(f'single quaternion   scipy {scipy_one * 1e6:7.2f} us   closed-form {fast_one * 1e6:7.2f} us'
+          f'   x{scipy_one / fast_one:.0f}')
+
+    scipy_loop = _per_call(lambda: [R.from_quat(row).as_euler('xyz') for row in qs], 500)
+    fast_batch = _per_call(lambda: quats_to_euler(qs), 20_000)
+    print(f'50 quaternions      scipy {scipy_loop * 1e6:7.2f} us   batched     {fast_batch * 1e6:7.2f} us'
+          f'   x{scipy_loop / fast_batch:.0f}')
+
+    msg = {'poses': [_pose_msg(row) for row in qs], 'marker_ids': list(range(len(qs)))}
+    decode = _per_call(lambda: ArucoMarkers.from_ros(msg), 2_000)
+    print(f'ArucoMarkers.from_ros, 50 markers: {decode * 1e6:.1f} us')
+
+    pose = _pose_msg(q)
+    decode = _per_call(lambda: Pose.from_ros(pose), 20_000)
+    print(f'Pose.from_ros: {decode * 1e6:.2f} us')
+
+    # Same angles as scipy, also at gimbal lock (pitch +-90 deg), where yaw is 0.
+    angles = rng.uniform(-1.5, 1.5, size=(20, 3))
+    angles[:, 1] = np.where(np.arange(20) % 2, np.pi / 2, -np.pi / 2)
+    locked = R.from_euler('xyz', angles).as_quat()
+    for name, quats in (('random', qs), ('gimbal lock', locked)):
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', UserWarning)  # scipy warns about gimbal lock.
+            expected = R.from_quat(quats).as_euler('xyz')
+        err = max(
+            np.abs(quats_to_euler(quats) - expected).max(),
+            np.abs(np.array([quat_to_euler(*row) for row in quats]) - expected).max(),
+        )
+        print(f'max |error| vs scipy, {name}: {err:.1e} rad')
+
+
+if __name__ == '__main__':
+    main()
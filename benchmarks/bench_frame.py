@@ -0,0 +1,60 @@
+"""
+Per-step row writes into a :class:`Frame`: one ``.at`` round trip per field on
+an object frame (how rows were written before the typed schema and row
+transactions) vs a ``with frame[i] as row`` transaction.
+
+Run from the repo root::
+
+    python benchmarks/bench_frame.py
+"""
+
+import timeit
+
+import numpy as np
+import pandas as pd
+
+from smartbot_irl.data._frame import Frame
+
+N_FIELDS = 15
+ROWS = 500
+
+
+def _row(i):
+    values = {f'f{j}': float(i + j) for j in range(N_FIELDS - 3)}
+    values.update(step=i, turning=bool(i % 2), mode='drive')
+    return values
+
+
+def per_field_at(rows):
+    """Baseline: object columns of pd.NA, ``df.at[i, col] = v`` per field."""
+    columns = list(_row(0))
+    df = pd.DataFrame(np.full((ROWS, len(columns)), pd.NA), columns=columns)
+    for i, values in enumerate(rows):
+        for col, val in values.items():
+            df.at[i, col] = val
+    return df
+
+
+def row_transaction(rows):
+    frame = Frame(init_capacity=ROWS)
+    for i, values in enumerate(rows):
+        with frame[i] as row:
+            for col, val in values.items():
+                setattr(row, col, val)
+    frame.commit()  # Count writing the staged rows into the columns too.
+    return frame
+
+
+def main():
+    rows = [_row(i) for i in range(ROWS)]
+    assert np.allclose(
+        row_transaction(rows).used['f3'].to_numpy(float), per_field_at(rows)['f3'].to_numpy(float)
+    )
+    print(f'{N_FIELDS}-field row writes, {ROWS} rows:')
+    for name, fn in (('per-field .at', per_field_at), ('row transaction', row_transaction)):
+        per_row = min(timeit.repeat(lambda: fn(rows), number=1, repeat=3)) / ROWS
+        print(f'  {name:16s} {per_row * 1e6:8.1f} us/row')
+
+
+if __name__ == '__main__':
+    main()
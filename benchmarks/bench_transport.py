@@ -0,0 +1,121 @@
+"""
+LaserScan over rosbridge: bytes on the wire and client decode time per message
+for each ``compression`` mode handled by ``smartbot_irl.robot.transport``.
+
+Frames are synthesized the way rosbridge builds them, so no robot is needed.
+Decode time covers frame -> rosbridge dict -> ``LaserScan``. Needs ``cbor2``.
+
+Run from the repo root::
+
+    python benchmarks/bench_transport.py
+"""
+
+import base64
+import io
+import json
+import struct
+import timeit
+
+import cbor2
+import numpy as np
+import pygame
+
+from smartbot_irl.data import LaserScan
+from smartbot_irl.robot.transport import CDR_PARSERS, decode_cbor, decode_png
+
+TOPIC = '/smartbot0/scan'
+
+
+def _scan(n, rng):
+    ranges = rng.uniform(0.1, 12.0, n).astype(np.float32)
+    ranges[rng.random(n) < 0.05] = np.inf
+    return {
+        'header': {'stamp': {'sec': 12, 'nanosec': 34}, 'frame_id': 'laser'},
+        'angle_min': -np.pi,
+        'angle_max': np.pi,
+        'angle_increment': 2 * np.pi / n,
+        'time_increment': 0.0,
+        'scan_time': 0.1,
+        'range_min': 0.1,
+        'range_max': 12.0,
+        'ranges': ranges,
+        'intensities': np.zeros(0, np.float32),
+    }
+
+
+def _json_frame(scan):
+    msg = {k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in scan.items()}
+    return json.dumps({'op': 'publish', 'topic': TOPIC, 'msg': msg}).encode()
+
+
+def _cbor_frame(scan):
+    msg = {k: cbor2.CBORTag(85, v.tobytes()) if isinstance(v, np.ndarray) else v for k, v in scan.items()}
+    return cbor2.dumps({'op': 'publish', 'topic': TOPIC, 'msg': msg})
+
+
+def _cdr(scan):
+    out = bytearray(b'\x00\x01\x00\x00')
+    frame_id = scan['header']['frame_id'].encode() + b'\0'
+    out += struct.pack('<iII', 12, 34, len(frame_id)) + frame_id
+    out += b'\0' * (-(len(out) - 4) % 4)
+    keys = ('angle_min', 'angle_max', 'angle_increment', 'time_increment', 'scan_time', 'range_min', 'range_max')
+    out += struct.pack('<7f', *(scan[k] for k in keys))
+    for key in ('ranges', 'intensities'):
+        out += struct.pack('<I', len(scan[key])) + scan[key].astype('<f4').tobytes()
+    return bytes(out)
+
+
+def _cbor_raw_frame(scan):
+    msg = {'secs': 12, 'nsecs': 34, 'bytes': _cdr(scan)}
+    return cbor2.dumps({'op': 'publish', 'topic': TOPIC, 'msg': msg})
+
+
+def _png_frame(scan):
+    # rosbridge: JSON text packed into a square RGB image, padded with newlines.
+    data = _json_frame(scan)
+    side = int(np.ceil(np.sqrt(len(data) / 3)))
+    data += b'\n' * (side * side * 3 - len(data))
+    buf = io.BytesIO()
+    pygame.image.save(pygame.image.frombytes(data, (side, side), 'RGB'), buf, 'msg.png')
+    return json.dumps({'op': 'png', 'data': base64.b64encode(buf.getvalue()).decode()}).encode()
+
+
+def _decode_json(frame):
+    return LaserScan.from_ros(json.loads(frame)['msg'])
+
+
+def _decode_cbor(frame):
+    return LaserScan.from_ros(decode_cbor(frame)['msg'])
+
+
+def _decode_cbor_raw(frame):
+    return LaserScan.from_ros(CDR_PARSERS['sensor_msgs/LaserScan'](decode_cbor(frame)['msg']['bytes']))
+
+
+def _decode_png(frame):
+    return LaserScan.from_ros(decode_png(json.loads(frame)['data'])['msg'])
+
+
+MODES = {
+    'none': (_json_frame, _decode_json),
+    'cbor': (_cbor_frame, _decode_cbor),
+    'cbor-raw': (_cbor_raw_frame, _decode_cbor_raw),
+    'png': (_png_frame, _decode_png),
+}
+
+
+def main():
+    rng = np.random.default_rng(0)
+    for n in (360, 1440):
+        scan = _scan(n, rng)
+        print(f'LaserScan, {n} beams')
+        for mode, (encode, decode) in MODES.items():
+            frame = encode(scan)
+            assert np.array_equal(decode(frame).ranges, scan['ranges'])
+            number = 200 if mode == 'png' else 2_000
+            per_msg = min(timeit.repeat(lambda: decode(frame), number=number, repeat=5)) / number
+            print(f'  {mode:9s} {len(frame):7d} bytes   decode {per_msg * 1e6:8.1f} us/msg')
+
+
+if __name__ == '__main__':
+    main()
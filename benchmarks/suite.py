@@ -0,0 +1,315 @@
+"""
+Decode/encode micro-benchmarks for the message types in ``smartbot_irl.data``.
+
+Every case runs on synthetic rosbridge payloads of realistic size (as they
+come out of ``json.loads``), so no robot or rosbridge is needed. For each case
+the suite reports:
+
+``msgs_per_sec`` / ``us_per_msg``
+    Best of several timed runs.
+``blocks_per_msg``
+    Memory blocks still allocated per message when the results are kept
+    (``sys.getallocatedblocks``), i.e. the size of what a call builds.
+``peak_bytes_per_msg``
+    Peak traced memory of one call (``tracemalloc``), transient
+    allocations included. Objects served from CPython's free lists (small
+    dicts, floats) are not traced, so small encoders may show 0.
+``cpu_percent``
+    Share of one core spent at the topic's nominal rate (``rate_hz``).
+
+Run from the repo root::
+
+    python benchmarks/suite.py                          # Print a table.
+    python benchmarks/suite.py -o results.json          # Also save JSON.
+    python benchmarks/suite.py --compare results.json   # Diff against a saved run.
+    python benchmarks/suite.py -k scan                  # Only cases matching 'scan'.
+"""
+
+import argparse
+import gc
+import json
+import math
+import platform
+import subprocess
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, NamedTuple
+
+import numpy as np
+
+from smartbot_irl.data import (
+    IMU,
+    ArucoMarkers,
+    JointState,
+    LaserScan,
+    LazySensorData,
+    PoseArray,
+    SensorData,
+    VectorLayout,
+)
+from smartbot_irl.data._type_maps import Odometry, String, quat_to_euler, quats_to_euler
+
+RATES = {'scan': 10, 'imu': 200, 'odom': 50, 'joints': 50, 'aruco': 30}  # Nominal topic rates, Hz.
+
+
+class Case(NamedTuple):
+    name: str
+    fn: Callable[[], Any]
+    rate_hz: float | None = None
+
+
+# --------------------------------------------------------------
+# Synthetic rosbridge payloads.
+def _roundtrip(msg: dict) -> dict:
+    """What rosbridge hands us: plain JSON types."""
+    return json.loads(json.dumps(msg))
+
+
+def _quat(rng) -> dict:
+    q = rng.normal(size=4)
+    q /= np.linalg.norm(q)
+    return dict(zip('xyzw', q.tolist()))
+
+
+def _pose(rng) -> dict:
+    x, y, z = rng.uniform(-3, 3, 3).tolist()
+    return {'position': {'x': x, 'y': y, 'z': z}, 'orientation': _quat(rng)}
+
+
+def _header(frame_id: str) -> dict:
+    return {'stamp': {'sec': 1700000000, 'nanosec': 123456789}, 'frame_id': frame_id}
+
+
+def odom_msg(rng) -> dict:
+    twist = {'linear': {'x': 0.3, 'y': 0.0, 'z': 0.0}, 'angular': {'x': 0.0, 'y': 0.0, 'z': 0.2}}
+    return _roundtrip(
+        {
+            'header': _header('odom'),
+            'child_frame_id': 'base_link',
+            'pose': {'pose': _pose(rng), 'covariance': [0.0] * 36},
+            'twist': {'twist': twist, 'covariance': [0.0] * 36},
+        }
+    )
+
+
+def imu_msg(rng) -> dict:
+    vec = lambda: dict(zip('xyz', rng.normal(size=3).tolist()))  # noqa: E731
+    return _roundtrip(
+        {
+            'header': _header('imu'),
+            'orientation': _quat(rng),
+            'orientation_covariance': [0.0] * 9,
+            'angular_velocity': vec(),
+            'angular_velocity_covariance': [0.0] * 9,
+            'linear_acceleration': vec(),
+            'linear_acceleration_covariance': [0.0] * 9,
+        }
+    )
+
+
+def scan_msg(rng, n: int) -> dict:
+    ranges = rng.uniform(0.1, 12.0, n)
+    ranges[rng.random(n) < 0.05] = math.inf
+    msg = {
+        'header': _header('laser'),
+        'angle_min': -math.pi,
+        'angle_max': math.pi,
+        'angle_increment': 2 * math.pi / n,
+        'time_increment': 0.0,
+        'scan_time': 0.1,
+        'range_min': 0.1,
+        'range_max': 12.0,
+        'ranges': ranges.tolist(),
+        'intensities': [],
+    }
+    return _roundtrip(msg)
+
+
+def joints_msg(rng, n: int = 2) -> dict:
+    return _roundtrip(
+        {
+            'header': _header(''),
+            'name': [f'joint_{i}' for i in range(n)],
+            'position': rng.normal(size=n).tolist(),
+            'velocity': rng.normal(size=n).tolist(),
+            'effort': [],
+        }
+    )
+
+
+def pose_array_msg(rng, n: int) -> dict:
+    return _roundtrip({'header': _header('base_link'), 'poses': [_pose(rng) for _ in range(n)]})
+
+
+def aruco_msg(rng, n: int) -> dict:
+    msg = pose_array_msg(rng, n)
+    msg['marker_ids'] = list(range(n))
+    return msg
+
+
+# --------------------------------------------------------------
+def build_cases() -> list[Case]:
+    rng = np.random.default_rng(0)
+    cases = []
+
+    def codec(name, cls, msg, rate=None):
+        obj = cls.from_ros(msg)
+        cases.append(Case(f'decode/{name}', lambda: cls.from_ros(msg), rate))
+        cases.append(Case(f'encode/{name}', obj.to_ros, rate))
+
+    codec('odom', Odometry, odom_msg(rng), RATES['odom'])
+    codec('imu', IMU, imu_msg(rng), RATES['imu'])
+    codec('joints', JointState, joints_msg(rng), RATES['joints'])
+    codec('string', String, {'data': 'open'})
+    for n in (360, 720, 1440):
+        codec(f'scan_{n}', LaserScan, scan_msg(rng, n), RATES['scan'])
+    for n in (0, 10, 50):
+        codec(f'aruco_{n}', ArucoMarkers, aruco_msg(rng, n), RATES['aruco'])
+    codec('pose_array_10', PoseArray, pose_array_msg(rng, 10))
+
+    # A full SensorData as the robot would have it mid-run.
+    data = SensorData.initialized()
+    data.odom = Odometry.from_ros(odom_msg(rng))
+    data.imu = IMU.from_ros(imu_msg(rng))
+    data.scan = LaserScan.from_ros(scan_msg(rng, 360))
+    data.joints = JointState.from_ros(joints_msg(rng))
+    data.seen_hexes = ArucoMarkers.from_ros(aruco_msg(rng, 10))
+    cases.append(Case('sensor_data/flatten', data.flatten))
+    cases.append(Case('sensor_data/to_ros', data.to_ros))
+    layout = VectorLayout(odom=True, imu=True, scan=360, joints=2)
+    buf = np.empty(layout.size)
+    cases.append(Case('sensor_data/to_vector', lambda: layout.pack(data, out=buf)))
+
+    # Callback + read cost of the lazy container (one IMU message).
+    lazy, imu = LazySensorData(), imu_msg(rng)
+
+    def lazy_imu():
+        lazy.set_raw('imu', IMU, imu)
+        return lazy.imu
+
+    cases.append(Case('lazy/set_raw', lambda: lazy.set_raw('imu', IMU, imu), RATES['imu']))
+    cases.append(Case('lazy/set_raw+read_imu', lazy_imu, RATES['imu']))
+
+    q = rng.normal(size=4).tolist()
+    qs = rng.normal(size=(50, 4))
+    cases.append(Case('euler/quat_to_euler', lambda: quat_to_euler(*q)))
+    cases.append(Case('euler/quats_to_euler_50', lambda: quats_to_euler(qs)))
+    return cases
+
+
+# --------------------------------------------------------------
+def _time_per_call(fn, budget: float) -> float:
+    number, elapsed = 1, 0.0
+    while elapsed < budget / 10:  # Calibrate so one run takes ~budget/5.
+        number *= 2
+        elapsed = timeit.timeit(fn, number=number)
+    number = max(1, int(number * budget / 5 / elapsed))
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number
+
+
+def _blocks_per_call(fn, n: int = 200) -> float:
+    fn()  # Warm caches (compiled decoders, lazy imports) before counting.
+    keep = [None] * n
+    gc.collect()
+    gc.disable()
+    try:
+        before = sys.getallocatedblocks()
+        for i in range(n):
+            keep[i] = fn()
+        after = sys.getallocatedblocks()
+    finally:
+        gc.enable()
+    return max(0.0, (after - before) / n)
+
+
+def _peak_bytes(fn) -> int:
+    fn()
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        result = fn()  # noqa: F841 -- keep it alive until the peak is read.
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peak - base
+
+
+def run_case(case: Case, budget: float) -> dict:
+    per_call = _time_per_call(case.fn, budget)
+    result = {
+        'us_per_msg': per_call * 1e6,
+        'msgs_per_sec': 1.0 / per_call,
+        'blocks_per_msg': _blocks_per_call(case.fn),
+        'peak_bytes_per_msg': _peak_bytes(case.fn),
+    }
+    if case.rate_hz:
+        result['rate_hz'] = case.rate_hz
+        result['cpu_percent'] = 100.0 * case.rate_hz * per_call
+    return result
+
+
+def _git_rev() -> str | None:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _metadata() -> dict:
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'git': _git_rev(),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+    }
+
+
+def _print_table(results: dict, baseline: dict | None) -> None:
+    header = f'{"case":32s} {"msgs/s":>12s} {"us/msg":>9s} {"blocks":>7s} {"peak B":>9s} {"cpu%":>6s}'
+    if baseline is not None:
+        header += f' {"vs base":>8s}'
+    print(header)
+    for name, r in results.items():
+        cpu = f'{r["cpu_percent"]:6.2f}' if 'cpu_percent' in r else f'{"":6s}'
+        line = (
+            f'{name:32s} {r["msgs_per_sec"]:12,.0f} {r["us_per_msg"]:9.2f} '
+            f'{r["blocks_per_msg"]:7.1f} {r["peak_bytes_per_msg"]:9d} {cpu}'
+        )
+        if baseline is not None:
+            old = baseline.get(name)
+            # >1 means faster than the baseline.
+            line += f' {old["us_per_msg"] / r["us_per_msg"]:7.2f}x' if old else f' {"new":>8s}'
+        print(line)
+
+
+def main(argv=None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-o', '--output', type=Path, help='Write results to this JSON file.')
+    parser.add_argument('--compare', type=Path, help='JSON file of an earlier run to compare against.')
+    parser.add_argument('-k', dest='pattern', default='', help='Only run cases whose name contains this.')
+    parser.add_argument('--budget', type=float, default=0.5, help='Approximate seconds of timing per case.')
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(args.compare.read_text())['results'] if args.compare else None
+    results = {}
+    for case in build_cases():
+        if args.pattern in case.name:
+            results[case.name] = run_case(case, args.budget)
+    _print_table(results, baseline)
+
+    report = {'meta': _metadata(), 'results': results}
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f'Wrote {args.output}')
+    return report
+
+
+if __name__ == '__main__':
+    main()
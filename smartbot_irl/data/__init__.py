@@ -1,19 +1,48 @@
 """Package pydoc for smartbot_irl.data"""
 
-from ._data import Command, SensorData, list_sensor_columns
+from ._data import Command, LazySensorData, SensorData, SensorSnapshot, list_sensor_columns
 from ._data_logging import State, timestamp
-from ._type_maps import IMU, Bool, JointState, LaserScan, Pose, PoseArray, ArucoMarkers
+from ._segments import load_state_log
+from ._recorder import SensorRecorder, SensorLog
+from ._decoders import RosField, decoder_for, message_type, register_message
+from ._topic_stats import TopicStamp, TopicStats
+from ._vector import VectorLayout
+from ._type_maps import (
+    IMU,
+    Bool,
+    JointState,
+    LaserScan,
+    Pose,
+    PoseArray,
+    ArucoMarkers,
+    PoseList,
+    PoseView,
+)
 
 
 __all__ = [
     'list_sensor_columns',
+    'LazySensorData',
+    'SensorSnapshot',
     'ArucoMarkers',
     'Pose',
     'LaserScan',
     'PoseArray',
+    'PoseList',
+    'PoseView',
     'IMU',
     'Bool',
     'State',
     'JointState',
     'timestamp',
+    'load_state_log',
+    'SensorRecorder',
+    'SensorLog',
+    'VectorLayout',
+    'TopicStamp',
+    'TopicStats',
+    'RosField',
+    'decoder_for',
+    'message_type',
+    'register_message',
 ]
@@ -0,0 +1,174 @@
+# columns.py
+"""
+Columnar row storage used by :class:`State`. Every column is its own growable
+NumPy buffer and all columns share one row count, so appending a row is
+amortized O(1) instead of the O(n) copy that ``pd.concat`` does.
+
+Column dtypes follow what pandas would have inferred for the same rows: bools,
+ints and floats get native buffers, anything else (strings, lists, ...) is
+stored as an object column. Missing cells are NaN, which means int columns are
+promoted to float and bool columns to object the first time a row skips them.
+"""
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+def _kind(value: Any) -> str:
+    """Return the NumPy dtype kind a single cell value should be stored as."""
+    if isinstance(value, (bool, np.bool_)):
+        return 'b'
+    if isinstance(value, (int, np.integer)):
+        return 'i'
+    if isinstance(value, (float, np.floating)):
+        return 'f'
+    return 'O'
+
+
+_DTYPES = {'b': np.bool_, 'i': np.int64, 'f': np.float64, 'O': object}
+
+
+def _fits(col_kind: str, value_kind: str) -> bool:
+    """Whether a value of ``value_kind`` can be written into a ``col_kind`` buffer."""
+    return col_kind == value_kind or col_kind == 'O' or (col_kind == 'f' and value_kind == 'i')
+
+
+def _promoted(col_kind: str, value_kind: str | None) -> str:
+    """Smallest kind holding both ``col_kind`` and ``value_kind`` (None = missing)."""
+    if col_kind == 'i' and value_kind in ('f', None):
+        return 'f'
+    return 'O'
+
+
+class ColumnStore:
+    """
+    Per-column growable NumPy buffers with amortized O(1) row appends.
+
+    Columns may appear at any time; earlier rows are back-filled with NaN.
+    Use :meth:`to_frame` to build a pandas DataFrame of the filled rows.
+
+    With ``ring=True`` the store never grows: once ``capacity`` rows are held
+    each append overwrites the oldest row in place. Buffers are then stored
+    rotated, so read them through :meth:`column` / :meth:`to_frame`, which
+    return rows oldest first.
+
+    Args:
+        capacity (int, optional): Rows to preallocate per column (the fixed
+            size in ring mode).
+        grow_factor (float, optional): Capacity multiplier when full.
+        ring (bool, optional): Overwrite the oldest rows instead of growing.
+    """
+
+    def __init__(self, capacity: int = 1024, grow_factor: float = 2.0, ring: bool = False):
+        self.columns: dict[str, np.ndarray] = {}
+        self.n_rows = 0
+        self.total_rows = 0  # Rows ever appended (> n_rows once a ring wraps).
+        self.ring = ring
+        self._capacity = max(int(capacity), 1)
+        self._grow_factor = grow_factor
+        self._start = 0  # Buffer index of the oldest row.
+
+    # --------------------------------------------------------------
+    def append(self, row: dict) -> None:
+        """Write ``row`` as the next row. Columns absent from ``row`` get NaN."""
+        i = self._start + self.n_rows
+        if i >= self._capacity:
+            if self.ring:
+                i -= self._capacity
+            else:
+                self._grow(int(max(i + 1, self._capacity * self._grow_factor)))
+
+        cols = self.columns
+        for name, value in row.items():
+            buf = cols.get(name)
+            if buf is None:
+                buf = self._add_column(name, _kind(value), self.n_rows > 0)
+            else:
+                kind = _kind(value)
+                if not _fits(buf.dtype.kind, kind):
+                    buf = self._retype(name, _promoted(buf.dtype.kind, kind))
+            buf[i] = value
+
+        if len(row) < len(cols):
+            for name, buf in cols.items():
+                if name not in row:
+                    if buf.dtype.kind in 'ib':
+                        buf = self._retype(name, _promoted(buf.dtype.kind, None))
+                    buf[i] = np.nan
+
+        if self.n_rows < self._capacity:
+            self.n_rows += 1
+        else:
+            self._start = (self._start + 1) % self._capacity
+        self.total_rows += 1
+
+    def set_column(self, name: str, value: Any) -> None:
+        """Replace (or create) a whole column from a scalar or a length-n sequence."""
+        n = self.n_rows
+        if np.ndim(value) == 0:
+            buf = np.empty(self._capacity, dtype=_DTYPES[_kind(value)])
+            buf[:] = value
+        else:
+            values = np.asarray(value)
+            if len(values) != n:
+                raise ValueError(f'Column {name!r} needs {n} values, got {len(values)}')
+            buf = np.empty(self._capacity, dtype=values.dtype)
+            buf[self._rows()] = values
+        self.columns[name] = buf
+
+    def column(self, name: str, last: int | None = None) -> np.ndarray:
+        """
+        Return column ``name`` oldest row first, optionally only the ``last``
+        rows. This is a view into the buffer unless a ring has wrapped.
+        """
+        rows = self._rows(last)
+        return self.columns[name][rows]
+
+    def to_frame(self, last: int | None = None) -> pd.DataFrame:
+        """
+        Return a new DataFrame holding a copy of the filled rows (or only the
+        ``last`` rows), oldest first. The index counts rows since the start of
+        the run, so it keeps increasing after a ring wraps.
+        """
+        count = self.n_rows if last is None else min(max(last, 0), self.n_rows)
+        rows = self._rows(count)
+        index = pd.RangeIndex(self.total_rows - count, self.total_rows)
+        return pd.DataFrame(
+            {name: buf[rows] for name, buf in self.columns.items()}, index=index, copy=True
+        )
+
+    # --------------------------------------------------------------
+    def _rows(self, last: int | None = None) -> slice | np.ndarray:
+        """Buffer indices of the filled rows in order (a slice unless a ring wrapped)."""
+        n = self.n_rows
+        first = 0 if last is None else n - min(max(last, 0), n)
+        start = self._start + first
+        stop = self._start + n
+        if stop <= self._capacity:
+            return slice(start, stop)
+        return np.arange(start, stop) % self._capacity
+
+    def _add_column(self, name: str, kind: str, backfill: bool) -> np.ndarray:
+        # Earlier rows are missing, so the column must be able to hold NaN.
+        if backfill and kind in 'ib':
+            kind = _promoted(kind, None)
+        buf = np.empty(self._capacity, dtype=_DTYPES[kind])
+        if backfill:
+            buf[:] = np.nan
+        self.columns[name] = buf
+        return buf
+
+    def _retype(self, name: str, kind: str) -> np.ndarray:
+        buf = self.columns[name].astype(_DTYPES[kind])
+        self.columns[name] = buf
+        return buf
+
+    def _grow(self, capacity: int) -> None:
+        n = self.n_rows
+        for name, old in self.columns.items():
+            buf = np.empty(capacity, dtype=old.dtype)
+            buf[:n] = old[:n]
+            self.columns[name] = buf
+        self._capacity = capacity
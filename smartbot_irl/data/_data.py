@@ -1,5 +1,8 @@
 from dataclasses import dataclass, fields, is_dataclass
-from typing import Any, Dict, Optional
+from functools import lru_cache
+from operator import attrgetter
+from time import time
+from typing import Any, Callable, Dict, Optional, get_type_hints
 
 from ._type_maps import (
     IMU,
@@ -12,12 +15,18 @@ from ._type_maps import (
     PoseArray,
     String,
 )
+from ._topic_stats import TopicStamp
+from ._vector import VectorLayout
 
 
 def list_sensor_columns() -> list[str]:
     """Return top-level keys from flatten()."""
-    s = SensorData.initialized()
-    return list(s.flatten().keys())
+    return list(_sensor_columns())
+
+
+@lru_cache(maxsize=None)
+def _sensor_columns() -> tuple[str, ...]:
+    return tuple(SensorData.initialized().flatten().keys())
 
 
 def flatten_generic(prefix: str, obj: Any) -> Dict[str, Any]:
@@ -55,14 +64,67 @@ def flatten_generic(prefix: str, obj: Any) -> Dict[str, Any]:
     return flat
 
 
+# A plan is (keys, getter): ``getter(value)`` returns the flattened values in
+# ``keys`` order. ``None`` means the value has no fixed layout (dicts).
+FlattenPlan = Optional[tuple[tuple[str, ...], Callable[[Any], tuple]]]
+
+
+@lru_cache(maxsize=None)
+def _flatten_plan(prefix: str, cls: type) -> FlattenPlan:
+    """
+    Compile how ``flatten_generic(prefix, obj)`` lays out an object of type
+    ``cls``, so it can be done with one precomputed getter instead of walking
+    ``fields()`` every call. Nested dataclass fields become dotted paths.
+    """
+    if cls is type(None):
+        return (), lambda obj: ()
+    if cls is dict or issubclass(cls, dict):
+        return None
+    if not is_dataclass(cls):
+        return (prefix,), lambda obj: (obj,)
+
+    keys, paths = [], []
+
+    def walk(key: str, path: str, dc: type) -> bool:
+        try:
+            hints = get_type_hints(dc)
+        except Exception:  # Unresolvable annotations: treat every field as a leaf.
+            hints = {}
+        for f in fields(dc):
+            hint = hints.get(f.name)
+            if isinstance(hint, type) and is_dataclass(hint):
+                if not walk(f'{key}_{f.name}', f'{path}{f.name}.', hint):
+                    return False
+            elif isinstance(hint, type) and issubclass(hint, dict):
+                return False
+            else:
+                keys.append(f'{key}_{f.name}')
+                paths.append(f'{path}{f.name}')
+        return True
+
+    if not walk(prefix, '', cls):
+        return None
+    if len(paths) == 1:
+        get = attrgetter(paths[0])
+        return tuple(keys), lambda obj: (get(obj),)
+    return tuple(keys), attrgetter(*paths)
+
+
 class SensorData:
     """
     Container for all SmartBot sensor topics.
     Each field starts as ``None`` and becomes a populated message
     object (LaserScan, Odometry, etc.) once that topic is received.
+
+    ``stamps`` maps a field name to the :class:`TopicStamp` (header stamp,
+    receive time, message count) of its latest message, for fields that
+    have received one.
     """
 
+    __slots__ = ('__dict__', 'stamps')
+
     def __init__(self) -> None:
+        self.stamps: dict[str, TopicStamp] = {}
         self.odom: Odometry = Odometry()
         self.scan: LaserScan = LaserScan()
         self.joints: JointState = JointState()
@@ -106,7 +168,7 @@ class SensorData:
         if self.aruco_poses:
             d['aruco_poses'] = self.aruco_poses.to_ros()
         if self.imu:
-            d['imu'] = self.imu.__dict__
+            d['imu'] = self.imu.to_ros()
         if self.gripper_curr_state:
             d['gripper_curr_state'] = self.gripper_curr_state.to_ros()
         if self.manipulator_curr_preset:
@@ -122,14 +184,163 @@ class SensorData:
         missing = [k for k, v in vars(self).items() if v is None]
         return f'SensorData(populated={keys}, missing={missing})'
 
+    def age(self, field_name: str, now: float | None = None) -> float:
+        """Seconds since ``field_name`` last received a message (inf if it never has)."""
+        stamp = self.stamps.get(field_name)
+        return float('inf') if stamp is None else stamp.age(now)
+
+    def to_vector(self, layout: VectorLayout, out=None):
+        """Pack the values selected by ``layout`` into a float vector (``out`` if given)."""
+        return layout.pack(self, out=out)
+
     def flatten(self) -> dict:
         """Return a partially flattened dict of all sensor fields."""
         out = {}
         for name, value in vars(self).items():
-            out.update(flatten_generic(name, value))
+            plan = _flatten_plan(name, type(value))
+            if plan is None:
+                out.update(flatten_generic(name, value))
+                continue
+            keys, get = plan
+            try:
+                out.update(zip(keys, get(value)))
+            except AttributeError:  # A nested message is None; take the slow path.
+                out.update(flatten_generic(name, value))
         return out
 
 
+class _Pending:
+    """A raw message decoded at most once, shared by a LazySensorData and its snapshots."""
+
+    __slots__ = ('cls', 'msg', '_value')
+
+    def __init__(self, cls: type, msg: dict):
+        self.cls = cls
+        self.msg = msg
+
+    def value(self):
+        msg = self.msg
+        if msg is not None:
+            self._value = self.cls.from_ros(msg)
+            self.msg = None  # Cleared after _value is set, so other threads never see neither.
+        return self._value
+
+
+class _LazyField:
+    """Data descriptor that decodes a pending raw message on first access."""
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        pending = obj._pending.pop(self.name, None)
+        if pending is not None:
+            obj.__dict__[self.name] = pending.value()
+        return obj.__dict__[self.name]
+
+    def __set__(self, obj, value) -> None:
+        obj._pending.pop(self.name, None)
+        obj.__dict__[self.name] = value
+
+
+class LazySensorData(SensorData):
+    """
+    :class:`SensorData` that decodes on read.
+
+    :meth:`set_raw` only stores the latest raw rosbridge dict of a field and
+    its receive time. The dict is decoded into the field's message type the
+    first time the field is read afterwards, so messages that are replaced
+    before anyone reads them are never decoded.
+
+    Example::
+        data = LazySensorData()
+        data.set_raw('scan', LaserScan, msg)  # Cheap: runs on the callback thread.
+        data.scan.ranges                      # Decodes here, once.
+    """
+
+    __slots__ = ('_pending', 'receive_times')
+
+    def __init__(self) -> None:
+        self._pending: dict[str, _Pending] = {}
+        self.receive_times: dict[str, float] = {}  # Field -> time.time() of its latest message.
+        super().__init__()
+
+    def set_raw(self, field_name: str, cls: type, msg: dict, t: float | None = None) -> None:
+        """Store ``msg`` to be decoded with ``cls.from_ros`` when ``field_name`` is next read."""
+        self.receive_times[field_name] = time() if t is None else t
+        self._pending[field_name] = _Pending(cls, msg)
+
+    def decode_pending(self) -> None:
+        """Decode every field that has received a message since it was last read."""
+        for name in list(self._pending):
+            getattr(self, name)
+
+    def flatten(self) -> dict:
+        self.decode_pending()
+        return super().flatten()
+
+    def __repr__(self):
+        self.decode_pending()
+        return super().__repr__()
+
+
+for _name in vars(SensorData()):
+    setattr(LazySensorData, _name, _LazyField(_name))
+
+
+class SensorSnapshot(LazySensorData):
+    """
+    Read-only view of a :class:`SensorData` as it was at one instant.
+
+    Taking one only copies references: receivers replace message objects
+    rather than mutating them, so no scan or marker array is copied. Fields
+    still pending in a :class:`LazySensorData` stay lazy and are decoded at
+    most once, however many snapshots share them.
+
+    The snapshot is shallow: only its fields are read-only. The message
+    objects (and their arrays and lists) are shared with the live data and
+    with other snapshots, so treat them as read-only too and copy before
+    modifying, e.g. ``ranges = snap.scan.ranges.copy()``.
+
+    Attributes:
+        seq (int): Sequence number of the source when the snapshot was taken.
+            It grows with every message received, so ``snap.seq != last.seq``
+            is a cheap "anything new?" test.
+        stamp (float): ``time.time()`` when the snapshot was taken.
+
+    Example::
+        snap = bot.read()
+        if snap.seq != last_seq:
+            last_seq = snap.seq
+            plan(snap.odom, snap.scan)  # Both from the same instant.
+    """
+
+    __slots__ = ('seq', 'stamp')
+
+    def __init__(self, data: SensorData, seq: int = 0) -> None:
+        set_ = object.__setattr__
+        lazy = isinstance(data, LazySensorData)
+        set_(self, '_pending', dict(data._pending) if lazy else {})
+        set_(self, 'receive_times', dict(data.receive_times) if lazy else {})
+        set_(self, 'stamps', dict(data.stamps))
+        set_(self, 'seq', seq)
+        set_(self, 'stamp', time())
+        self.__dict__.update(data.__dict__)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'SensorSnapshot is read-only (cannot set {name!r})')
+
+    def __delattr__(self, name):
+        raise AttributeError(f'SensorSnapshot is read-only (cannot delete {name!r})')
+
+    def __repr__(self):
+        self.decode_pending()
+        keys = [k for k, v in vars(self).items() if v is not None]
+        return f'SensorSnapshot(seq={self.seq}, populated={keys})'
+
+
 @dataclass
 class Command:
     """
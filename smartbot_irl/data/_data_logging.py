@@ -1,11 +1,16 @@
 # data_logging.py
 from dataclasses import dataclass, field
 from datetime import datetime
+from pathlib import Path
 from time import time
 from types import SimpleNamespace
 
+import numpy as np
 import pandas as pd
 
+from ._columns import ColumnStore
+from ._segments import SegmentedStore
+
 """
 This class should take a list of strings to make new columns for. Then it should
 offer intellisense for these columns. This will make it so students can
@@ -21,16 +26,44 @@ proper.
 
 @dataclass
 class State:
-    state_vec: pd.DataFrame = field(init=False)
+    """
+    Row-per-step log of a run.
+
+    Rows are kept in per-column NumPy buffers (see :class:`ColumnStore`) so that
+    :meth:`append_row` stays cheap however long the run is. The pandas
+    DataFrame in :attr:`state_vec` is only built when something asks for it
+    (``.plot()``, ``.to_csv()``, ``states['x']``, ...) and is then reused until
+    the next append.
+
+    Args:
+        max_rows (int, optional): Keep only the most recent ``max_rows`` rows.
+            Older rows are overwritten in place so memory and per-step cost
+            stay flat on long runs. By default every row is kept.
+        spill_dir (str | Path, optional): Keep the full history on disk
+            instead of in RAM. Every ``segment_rows`` rows are written to this
+            directory by a background thread and memory-mapped back; only the
+            newest segment stays in memory. Read a finished run back with
+            :func:`load_state_log`.
+        segment_rows (int, optional): Rows per on-disk segment.
+    """
+
+    max_rows: int | None = None
+    spill_dir: str | Path | None = None
+    segment_rows: int = 4096
     next_index: int = field(default=0, init=False)
+    _store: ColumnStore | SegmentedStore = field(init=False, repr=False)
+    _frame: pd.DataFrame | None = field(default=None, init=False, repr=False)
+    _last: SimpleNamespace = field(default_factory=SimpleNamespace, init=False, repr=False)
 
     def __post_init__(self):
-        # Create an empty DataFrame
-        self.state_vec = pd.DataFrame()
-        # self.state_vec = pd.DataFrame(columns=[
-        #     "t_epoch", "time", "t_prev", "t_elapsed", "turning",
-        #     "x", "y"  # if you want these to exist for plotting
-        # ])
+        if self.max_rows is not None and self.spill_dir is not None:
+            raise ValueError('State takes either max_rows or spill_dir, not both.')
+        if self.spill_dir is not None:
+            self._store = SegmentedStore(self.spill_dir, segment_rows=self.segment_rows)
+        elif self.max_rows is not None:
+            self._store = ColumnStore(capacity=self.max_rows, ring=True)
+        else:
+            self._store = ColumnStore()
 
         # TODO init first row in student code.
         seed = {
@@ -44,33 +77,71 @@ class State:
         self.append_row(seed)
 
     def append_row(self, rowdict: dict):
-        # Build the row DataFrame
-        row_df = pd.DataFrame([rowdict])
+        # New columns are back-filled with NaN, missing ones get NaN this row.
+        self._store.append(rowdict)
+        self.next_index = self._store.total_rows
+        self._frame = None
+
+        # Keep the last-row view in step without going through pandas.
+        last = self._last.__dict__
+        last.update(rowdict)
+        if len(last) > len(rowdict):
+            for name in last:
+                if name not in rowdict:
+                    last[name] = np.nan
+
+    def flush(self) -> None:
+        """
+        With ``spill_dir``, write every row logged so far to disk and wait for it.
+        Raises the first error the background writer hit since the last flush.
+        """
+        if isinstance(self._store, SegmentedStore):
+            self._store.flush()
+
+    def close(self) -> None:
+        """With ``spill_dir``, flush and stop the background writer (the log stays readable)."""
+        if isinstance(self._store, SegmentedStore):
+            self._store.close()
 
-        # Concat first
-        self.state_vec = pd.concat([self.state_vec, row_df], ignore_index=True)
+    @property
+    def state_vec(self) -> pd.DataFrame:
+        """The retained rows as a DataFrame (built lazily, cached until the next append)."""
+        if self._frame is None:
+            self._frame = self._store.to_frame()
+        return self._frame
 
-        # Only after concat do we back-fill any missing columns
-        # (Pandas will align for new columns automatically)
-        for col in rowdict:
-            if col not in self.state_vec.columns:
-                self.state_vec[col] = pd.NA
+    def window(self, rows: int) -> pd.DataFrame:
+        """Return only the most recent ``rows`` rows, oldest first, e.g. for live plots."""
+        return self._store.to_frame(last=rows)
 
     @property
     def last(self) -> SimpleNamespace:
-        return SimpleNamespace(**self.state_vec.iloc[-1].to_dict())
+        """
+        The most recent row with dot access to every column.
+
+        This is one cached object that :meth:`append_row` updates in place, so
+        reading it costs nothing. Copy it (``SimpleNamespace(**vars(states.last))``)
+        if you need a row to survive the next append.
+        """
+        return self._last
 
     def __getattr__(self, name):
-        # Prevent recursion: if 'state_vec' is missing, raise
-        if name == 'state_vec':
-            raise AttributeError
+        # Prevent recursion: private attributes are never DataFrame attributes.
+        if name.startswith('_') or name == 'state_vec':
+            raise AttributeError(name)
         return getattr(self.state_vec, name)
 
     def __getitem__(self, key):
         return self.state_vec[key]
 
     def __setitem__(self, key, value):
-        self.state_vec[key] = value
+        self._store.set_column(key, value)
+        self._frame = None
+        if self._store.n_rows:
+            setattr(self._last, key, self._store.column(key, last=1)[0])
+
+    def __repr__(self):
+        return repr(self.state_vec)
 
 
 def timestamp():
@@ -0,0 +1,243 @@
+# decoders.py
+"""
+One decoding path for rosbridge messages.
+
+Each message class declares where its attributes live in the rosbridge dict::
+
+    @dataclass
+    class Odometry:
+        ros_type = 'nav_msgs/Odometry'
+        ros_fields = {
+            'x': 'pose.pose.position.x',
+            ...
+        }
+
+:func:`decoder_for` turns that spec into one flat Python function (generated
+source, compiled once and cached) that walks every shared sub-dict a single
+time. Plain dataclasses (no ``__post_init__``, no descriptor fields in the
+spec) are filled in directly through ``__dict__`` or their slots instead of
+going through ``__init__``; anything else gets a keyword constructor call.
+``from_ros`` on every message class goes through it, and batch decoders such
+as ``PoseList.from_ros`` use :func:`row_decoder_for` on the same spec.
+
+A spec value is either a dotted path or a :class:`RosField`. Missing keys fall
+back to the ``RosField`` default, else to the dataclass field's default (or
+``default_factory``).
+"""
+
+import math
+from types import MemberDescriptorType
+from dataclasses import MISSING, fields, is_dataclass
+from typing import Any, Callable, NamedTuple
+
+_ABSENT = object()
+
+
+class RosField(NamedTuple):
+    """
+    Where one attribute comes from in a rosbridge dict.
+
+    Args:
+        path (str): Dotted key path, e.g. ``'pose.pose.position.x'``.
+        default (optional): Value used when the path is missing.
+        convert (Callable, optional): Applied to the value when it is present,
+            e.g. ``float`` or ``np.asarray``.
+    """
+
+    path: str
+    default: Any = MISSING
+    convert: Callable[[Any], Any] | None = None
+
+
+_TYPES: dict[str, type] = {}  # ros_type -> message class
+_SPECS: dict[type, dict[str, str | RosField]] = {}  # Explicitly registered specs.
+_DECODERS: dict[type, Callable[[dict], Any]] = {}  # Compiled, per class.
+_ROW_DECODERS: dict[tuple[type, tuple[str, ...]], Callable[[dict], tuple]] = {}  # Per class and attrs.
+
+
+def register_message(cls: type, ros_fields: dict | None = None, ros_type: str | None = None) -> type:
+    """
+    Register a message class so it can be decoded by ROS type name.
+
+    ``ros_fields`` and ``ros_type`` default to the class attributes of the same
+    name. Can be used as a class decorator.
+
+    Example::
+        @register_message
+        @dataclass
+        class Battery:
+            ros_type = 'sensor_msgs/BatteryState'
+            ros_fields = {'voltage': 'voltage', 'percent': 'percentage'}
+            voltage: float = 0.0
+            percent: float = 0.0
+    """
+    if ros_fields is not None:
+        _SPECS[cls] = ros_fields
+    ros_type = ros_type or getattr(cls, 'ros_type', None)
+    if ros_type:
+        _TYPES[ros_type] = cls
+    _DECODERS.pop(cls, None)
+    for key in [k for k in _ROW_DECODERS if k[0] is cls]:
+        del _ROW_DECODERS[key]
+    return cls
+
+
+def message_type(ros_type: str) -> type:
+    """The class registered for ``ros_type`` (e.g. ``'nav_msgs/Odometry'``)."""
+    try:
+        return _TYPES[ros_type]
+    except KeyError:
+        raise KeyError(f'No message class registered for {ros_type!r}') from None
+
+
+def decoder_for(cls: type | str) -> Callable[[dict], Any]:
+    """Compiled ``msg -> instance`` function for a message class or ROS type name."""
+    if isinstance(cls, str):
+        cls = message_type(cls)
+    decoder = _DECODERS.get(cls)
+    if decoder is None:
+        decoder = _DECODERS[cls] = _compile(cls)
+    return decoder
+
+
+def row_decoder_for(cls: type, attrs: tuple[str, ...]) -> Callable[[dict], tuple]:
+    """Compiled ``msg -> tuple`` of ``attrs`` from the spec of ``cls``, for filling arrays."""
+    key = (cls, attrs)
+    decoder = _ROW_DECODERS.get(key)
+    if decoder is None:
+        decoder = _ROW_DECODERS[key] = _compile_row(cls, attrs)
+    return decoder
+
+
+# --------------------------------------------------------------
+def _spec(cls: type) -> dict[str, str | RosField]:
+    for klass in cls.__mro__:
+        if klass in _SPECS:
+            return _SPECS[klass]
+    spec = getattr(cls, 'ros_fields', None)
+    if spec is None:
+        raise TypeError(f'{cls.__name__} has no ros_fields spec to decode with')
+    return spec
+
+
+def _expressions(
+    cls: type, spec: dict[str, RosField], dc_fields: dict, env: dict, lines: list[str]
+) -> list[str]:
+    """``attr=<expr>`` per spec entry, emitting the lookups they need into ``lines``."""
+    parents: dict[tuple[str, ...], str] = {(): 'msg'}
+    kwargs = []
+
+    def parent(keys: tuple[str, ...]) -> str:
+        """Local variable holding the sub-dict at ``keys``, emitting its lookup once."""
+        var = parents.get(keys)
+        if var is None:
+            outer = parent(keys[:-1])
+            var = parents[keys] = f'm{len(parents)}'
+            lines.append(f'    {var} = {outer}.get({keys[-1]!r}, _EMPTY)')
+        return var
+
+    for i, (attr, entry) in enumerate(spec.items()):
+        *outer, key = entry.path.split('.')
+        src = parent(tuple(outer))
+
+        default, factory = entry.default, MISSING
+        if default is MISSING and attr in dc_fields:
+            default, factory = dc_fields[attr].default, dc_fields[attr].default_factory
+        if default is MISSING and factory is MISSING:
+            raise TypeError(f'{cls.__name__}.{attr} needs a default in ros_fields')
+
+        if entry.convert is None and factory is MISSING and _literal(default):
+            kwargs.append(f'{attr}={src}.get({key!r}, {default!r})')
+            continue
+
+        env[f'_d{i}'] = default
+        env[f'_f{i}'] = factory
+        env[f'_c{i}'] = entry.convert
+        missing = f'_f{i}()' if factory is not MISSING else f'_d{i}'
+        present = f'_c{i}(v{i})' if entry.convert is not None else f'v{i}'
+        lines.append(f'    v{i} = {src}.get({key!r}, _ABSENT)')
+        kwargs.append(f'{attr}={missing} if v{i} is _ABSENT else {present}')
+    return kwargs
+
+
+def _normalized_spec(cls: type) -> dict[str, RosField]:
+    return {attr: RosField(entry) if isinstance(entry, str) else entry for attr, entry in _spec(cls).items()}
+
+
+def _exec(name: str, lines: list[str], env: dict) -> Callable:
+    body = '\n'.join(lines)
+    source = f'def {name}(msg):\n{body}\n'
+    exec(compile(source, f'<decoder {name}>', 'exec'), env)
+    decoder = env[name]
+    decoder.source = source
+    return decoder
+
+
+def _compile(cls: type) -> Callable[[dict], Any]:
+    """Generate and compile the flat decoder for ``cls``."""
+    dc_fields = {f.name: f for f in fields(cls)} if is_dataclass(cls) else {}
+    spec = _normalized_spec(cls)
+    env: dict[str, Any] = {'_cls': cls, '_new': object.__new__, '_ABSENT': _ABSENT, '_EMPTY': {}}
+    lines: list[str] = []
+    kwargs = _expressions(cls, spec, dc_fields, env, lines)
+
+    if _fill_directly(cls, spec, dc_fields):
+        # Fields outside the spec still need their defaults set on the instance.
+        for name, f in dc_fields.items():
+            if name in spec or _is_descriptor(cls, name):
+                continue
+            env[f'_d_{name}'], env[f'_f_{name}'] = f.default, f.default_factory
+            kwargs.append(f'{name}=_f_{name}()' if f.default is MISSING else f'{name}=_d_{name}')
+        lines.append('    obj = _new(_cls)')
+        if cls.__dictoffset__:
+            lines.append('    obj.__dict__.update(' + ', '.join(kwargs) + ')')
+        else:
+            lines += [f"    obj.{kw.replace('=', ' = ', 1)}" for kw in kwargs]
+        lines.append('    return obj')
+    else:
+        lines.append('    return _cls(' + ', '.join(kwargs) + ')')
+    return _exec(f'decode_{cls.__name__}', lines, env)
+
+
+def _compile_row(cls: type, attrs: tuple[str, ...]) -> Callable[[dict], tuple]:
+    """Generate and compile a decoder returning the tuple of ``attrs`` instead of an instance."""
+    dc_fields = {f.name: f for f in fields(cls)} if is_dataclass(cls) else {}
+    spec = _normalized_spec(cls)
+    missing = [a for a in attrs if a not in spec]
+    if missing:
+        raise KeyError(f'{cls.__name__}.ros_fields has no {missing}')
+    env: dict[str, Any] = {'_ABSENT': _ABSENT, '_EMPTY': {}}
+    lines: list[str] = []
+    kwargs = _expressions(cls, {a: spec[a] for a in attrs}, dc_fields, env, lines)
+    lines.append('    return (' + ', '.join(kw.split('=', 1)[1] for kw in kwargs) + ',)')
+    return _exec(f'decode_{cls.__name__}_row', lines, env)
+
+
+def _literal(value: Any) -> bool:
+    """Whether ``repr(value)`` can be inlined into the generated source."""
+    if type(value) is float:
+        return math.isfinite(value)
+    return type(value) in (int, bool, str)
+
+
+def _is_descriptor(cls: type, name: str) -> bool:
+    """Whether ``name`` is a data descriptor on ``cls`` (other than a plain slot)."""
+    for klass in cls.__mro__:
+        if name in klass.__dict__:
+            attr = klass.__dict__[name]
+            return hasattr(type(attr), '__set__') and not isinstance(attr, MemberDescriptorType)
+    return False
+
+
+def _fill_directly(cls: type, spec: dict, dc_fields: dict) -> bool:
+    """Whether instances can be built by filling ``__dict__`` or slots without running ``__init__``."""
+    if not dc_fields or hasattr(cls, '__post_init__'):
+        return False
+    if not cls.__dictoffset__ and not all(
+        isinstance(getattr(cls, name, None), MemberDescriptorType) or _is_descriptor(cls, name)
+        for name in dc_fields
+    ):
+        return False
+    if any(f.init is False for f in dc_fields.values()):
+        return False
+    return all(name in dc_fields and not _is_descriptor(cls, name) for name in spec)
@@ -1,82 +1,323 @@
 import pandas as pd
 import numpy as np
 
+from ._columns import _fits, _kind, _promoted
+
+# Column dtype per value kind. Ints and bools use pandas' masked dtypes so a
+# missing cell does not force the whole column to object.
+_PD_DTYPES = {"b": "boolean", "i": "Int64", "f": "float64", "O": object}
+_TYPE_KINDS = {bool: "b", int: "i", float: "f", "bool": "b", "int": "i", "float": "f"}
+
+
+def _as_dtype(t):
+    """Map a Python type / annotation to a column dtype; pass real dtypes through."""
+    if isinstance(t, (type, str)) and t in _TYPE_KINDS:
+        return _PD_DTYPES[_TYPE_KINDS[t]]
+    if isinstance(t, type) and not issubclass(t, np.generic):
+        return object  # str, list, custom classes, ...
+    try:
+        return pd.api.types.pandas_dtype(t)
+    except TypeError:
+        return object  # Annotations such as "list[float]".
+
+
+def _blank(n, columns, schema):
+    """``n`` all-missing rows with each column already in its schema dtype."""
+    index = pd.RangeIndex(n)
+    return pd.DataFrame(
+        {c: pd.Series(index=index, dtype=schema.get(c, object)) for c in columns}, index=index
+    )
+
+
+def _values_kind(values):
+    """Kind of a column holding all of ``values``; None if they are all missing."""
+    kinds = {_kind(v) for v in values if v is not None and v is not pd.NA}
+    if len(kinds) > 1:
+        return "f" if kinds == {"i", "f"} else "O"
+    return kinds.pop() if kinds else None
+
 
 class Frame(pd.DataFrame):
-    """A DataFrame that auto-grows and allows both Series and per-row dot access."""
+    """A DataFrame that auto-grows and allows both Series and per-row dot access.
+
+    Columns are stored in native dtypes: float64 with NaN for floats and
+    pandas' masked ``Int64`` / ``boolean`` for ints and bools. The dtypes come
+    from ``schema`` (column -> type or dtype), from a subclass's annotations,
+    or otherwise from the first value written to each column.
+
+    Writes through a row (``frame[i].x = ...``) are buffered on that row and
+    committed together when the row's ``with`` block ends, when another row
+    is accessed, or on :meth:`commit`. Committed rows are staged and written
+    to the columns in bulk, one assignment per column, the next time the
+    frame is read: indexing it, ``loc`` / ``iloc`` / ``at`` / ``iat``,
+    ``used`` and ``repr`` all commit first. Call :meth:`commit` yourself
+    before using other pandas methods on a frame that is being written.
+
+    With ``ring=True`` the frame keeps a fixed ``init_capacity`` rows and row
+    ``i`` lives in slot ``i % init_capacity``, so new rows overwrite the oldest
+    ones in place instead of growing the frame. ``used`` returns the live rows
+    oldest first.
 
-    _metadata = ["_next_row", "_capacity", "_grow_factor"]
+    Example::
+        class Log(Frame):
+            t: float
+            x: float
+            turning: bool
 
-    def __init__(self, *args, columns=None, init_capacity=1000, grow_factor=2.0, **kwargs):
+        log = Log()
+        with log[0] as row:
+            row.t = 0.0
+            row.x = 1.5
+    """
+
+    _metadata = ["_next_row", "_capacity", "_grow_factor", "_ring", "_untyped", "_open_row"]
+
+    def __init__(
+        self,
+        *args,
+        columns=None,
+        schema=None,
+        init_capacity=1000,
+        grow_factor=2.0,
+        ring=False,
+        **kwargs,
+    ):
         if not args and columns is None:
             columns = self._default_columns()
-        super().__init__(np.full((init_capacity, len(columns)), pd.NA), columns=columns, **kwargs)
+        schema = {c: _as_dtype(t) for c, t in {**self._default_schema(), **(schema or {})}.items()}
+        columns = list(columns) + [c for c in schema if c not in columns]
+        super().__init__(_blank(init_capacity, columns, schema), **kwargs)
         self._capacity = init_capacity
         self._next_row = 0
         self._grow_factor = grow_factor
+        self._ring = ring
+        self._untyped = {c for c in columns if c not in schema}  # Typed on first write.
+        self._open_row = None  # Row proxy holding uncommitted writes.
 
     # --------------------------------------------------------------
     def _default_columns(self):
         """Hook for subclasses: infer from __annotations__."""
-        if hasattr(self, "__annotations__"):
-            return list(self.__annotations__.keys())
-        return []
+        return list(self._default_schema())
+
+    def _default_schema(self):
+        """Hook for subclasses: column types from the annotations of Frame subclasses."""
+        schema = {}
+        for cls in reversed(type(self).__mro__):
+            if issubclass(cls, Frame) and cls is not Frame:
+                schema.update(vars(cls).get("__annotations__", {}))
+        return schema
 
     # --------------------------------------------------------------
     def __getitem__(self, key):
         if not isinstance(key, int):
+            self.commit()
             return super().__getitem__(key)
+        self._stage_open_row()
         if key < 0:
             key = self._next_row + key
+        if self._ring:
+            return _RowProxy(self, self._ring_slot(key))
         if key >= self._next_row:
             self._ensure_capacity(key + 1)
             self._next_row = key + 1
         return _RowProxy(self, key)
 
+    def _ring_slot(self, key):
+        """Map row ``key`` to its slot, clearing slots that get reused."""
+        if key < self._next_row - self._capacity or key < 0:
+            raise IndexError(f"Row {key} has already been overwritten")
+        if key >= self._next_row:
+            # Rows being reused still hold values from a full lap ago.
+            first = max(self._next_row, self._capacity)
+            cleared = dict.fromkeys(self.columns, pd.NA)
+            for k in range(max(first, key + 1 - self._capacity), key + 1):
+                self._set_row(k % self._capacity, dict(cleared))
+            self._next_row = key + 1
+        return key % self._capacity
+
     def _ensure_capacity(self, needed):
         if needed <= self._capacity:
             return
         new_capacity = int(max(needed, self._capacity * self._grow_factor))
-        extra = pd.DataFrame(
-            np.full((new_capacity - self._capacity, len(self.columns)), pd.NA),
-            columns=self.columns,
-        )
+        extra = _blank(new_capacity - self._capacity, self.columns, self.dtypes.to_dict())
         self._capacity = new_capacity
         super(Frame, self).__init__(pd.concat([self, extra], ignore_index=True))
 
     @property
     def used(self):
         """Return the portion of the DataFrame actually filled."""
-        return self.iloc[: self._next_row]
+        self.commit()
+        if not self._ring or self._next_row <= self._capacity:
+            return self.iloc[: self._next_row]
+        # Ring has wrapped: rotate so rows come out oldest first.
+        start = self._next_row - self._capacity
+        order = np.arange(start, self._next_row) % self._capacity
+        used = self.iloc[order]
+        used.index = pd.RangeIndex(start, self._next_row)
+        return used
+
+    def commit(self):
+        """Write out the row currently being written and all staged rows, if any."""
+        self._stage_open_row()
+        self._write_staged()
+
+    def _stage_open_row(self):
+        """Move the pending writes of the row being written to the staged rows."""
+        row = self.__dict__.get("_open_row")
+        if row is not None:
+            self._open_row = None
+            row.commit()
+
+    @property
+    def loc(self):
+        self.commit()
+        return super().loc
+
+    @property
+    def iloc(self):
+        self.commit()
+        return super().iloc
+
+    @property
+    def at(self):
+        self.commit()
+        return super().at
+
+    @property
+    def iat(self):
+        self.commit()
+        return super().iat
+
+    def __repr__(self):
+        self.commit()
+        return super().__repr__()
+
+    def _repr_html_(self):
+        self.commit()
+        return super()._repr_html_()
+
+    def _open(self, row):
+        """Make ``row`` the one collecting writes, committing the previous one."""
+        if self.__dict__.get("_open_row") is not row:
+            self._stage_open_row()
+            self._open_row = row
+
+    def _set_row(self, idx, values):
+        """Commit one row of writes to the staged rows; see :meth:`_write_staged`."""
+        staged = self.__dict__.get("_staged")
+        if staged is None:
+            staged = {}
+            object.__setattr__(self, "_staged", staged)
+        row = staged.get(idx)
+        if row is None:
+            staged[idx] = values
+        else:
+            row.update(values)
+
+    def _write_staged(self):
+        """Write all staged rows into the columns, one assignment per column."""
+        staged = self.__dict__.get("_staged")
+        if not staged:
+            return
+        object.__setattr__(self, "_staged", {})
+        by_column = {}  # Column -> (row positions, values).
+        for idx, values in staged.items():
+            for col, val in values.items():
+                cell = by_column.get(col)
+                if cell is None:
+                    by_column[col] = cell = ([], [])
+                cell[0].append(idx)
+                cell[1].append(val)
+
+        new = [c for c in by_column if c not in self.columns]
+        if new:
+            self[new] = _blank(len(self), new, {}).set_axis(self.index)
+            self._untyped.update(new)
+        for col, (idxs, vals) in by_column.items():
+            self._write_column(col, idxs, vals)
+
+    def _write_column(self, col, idxs, vals):
+        """Write ``vals`` into rows ``idxs`` of ``col``, typing or widening the column to fit."""
+        kind = _values_kind(vals)
+        column = super().__getitem__(col)
+        if col in self._untyped:
+            if kind is None:
+                return  # Still nothing but missing values; type it on a real one.
+            self._untyped.discard(col)
+            column = column.astype(_PD_DTYPES[kind])
+        elif kind is not None and not _fits(column.dtype.kind, kind):
+            # e.g. a float into an Int64 column.
+            column = column.astype(_PD_DTYPES[_promoted(column.dtype.kind, kind)])
+        if column.dtype.kind == "f":
+            vals = [np.nan if v is None or v is pd.NA else v for v in vals]
+        array = column.array.copy()
+        try:
+            array[idxs] = vals
+        except (TypeError, ValueError):
+            column = column.astype(object)
+            array = column.array.copy()
+            array[idxs] = vals
+        self[col] = pd.Series(array, index=self.index, dtype=column.dtype)
+
+    def _cell(self, idx, col):
+        """One value, from the staged rows if it has not been written yet."""
+        staged = self.__dict__.get("_staged")
+        if staged:
+            row = staged.get(idx)
+            if row is not None and col in row:
+                return row[col]
+            if col not in self.columns:
+                self.commit()  # A column only staged rows have so far.
+        if col not in self.columns:
+            raise AttributeError(f"No column '{col}'")
+        return super().__getitem__(col).iat[idx]
 
     # --------------------------------------------------------------
     def __getattr__(self, name):
         """Make df.col work like df['col'] if it exists."""
         # Avoid recursion and metadata
+        if name not in self.columns and self.__dict__.get("_staged"):
+            self.commit()  # May add a column only staged rows have so far.
         if name in self.columns:
             return self[name]
         raise AttributeError(f"{type(self).__name__!r} has no attribute {name!r}")
 
 
 class _RowProxy:
-    """Per-row dot-access wrapper."""
+    """Per-row dot-access wrapper that buffers writes until :meth:`commit`."""
 
     def __init__(self, parent: Frame, idx: int):
         object.__setattr__(self, "parent", parent)
         object.__setattr__(self, "idx", idx)
+        object.__setattr__(self, "pending", {})
 
     def __getattr__(self, col):
-        if col not in self.parent.columns:
-            raise AttributeError(f"No column '{col}'")
-        return self.parent.at[self.idx, col]
+        pending = self.pending
+        if col in pending:
+            return pending[col]
+        return self.parent._cell(self.idx, col)
 
     def __setattr__(self, col, val):
-        if col in ("parent", "idx"):
+        if col in ("parent", "idx", "pending"):
             object.__setattr__(self, col, val)
             return
-        if col not in self.parent.columns:
-            self.parent[col] = pd.NA
-        self.parent.at[self.idx, col] = val
+        if not self.pending:
+            self.parent._open(self)
+        self.pending[col] = val
+
+    def commit(self):
+        """Write every buffered field to the frame in one pass."""
+        if self.pending:
+            pending = self.pending
+            object.__setattr__(self, "pending", {})
+            self.parent._set_row(self.idx, pending)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.commit()
 
     def __repr__(self):
+        self.commit()
         return repr(self.parent.loc[self.idx])
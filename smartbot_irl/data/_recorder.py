@@ -0,0 +1,262 @@
+# recorder.py
+"""
+Record every raw rosbridge message SmartBotReal receives, and read the
+recordings back.
+
+A log is a data file plus two small sidecar files. ``<path>`` holds the records back to back, each one a
+fixed header followed by a pickled payload::
+
+    <B kind> <d recv_time> <H topic_id> <I payload_len> <payload>
+
+Kind 0 is a message (payload is the rosbridge dict) and kind 1 declares a
+topic id (payload is ``{"name": ..., "type": ...}`` as JSON) before its first
+message. ``<path>.idx`` holds one ``(time, offset, topic_id)`` entry per
+message so a reader can seek by time and topic without scanning the data file,
+and ``<path>.topics`` lists the topic declarations as JSON. If either is missing
+or cut short (e.g. after a crash) it is rebuilt from the data file.
+
+Payloads are pickled, so only open logs you trust.
+"""
+
+import json
+import logging
+import pickle
+import queue
+import struct
+import threading
+from pathlib import Path
+from time import time
+from typing import Any, Iterator
+
+import numpy as np
+
+from ..utils import SmartLogger
+
+logger = SmartLogger(level=logging.INFO)
+
+MAGIC = b'SBLOG1\n'
+_RECORD = struct.Struct('<BdHI')
+_INDEX_ENTRY = struct.Struct('<dQH')
+_INDEX = np.dtype([('time', '<f8'), ('offset', '<u8'), ('topic', '<u2')])
+_MESSAGE, _TOPIC = 0, 1
+
+
+class SensorRecorder:
+    """
+    Append every message passed to :meth:`record` to a binary log.
+
+    :meth:`record` only timestamps the message and queues it, so it is safe to
+    call from subscription callbacks. Pickling and file I/O happen on a
+    background writer thread. A message that cannot be written is logged and
+    skipped; the first such error is raised again by :meth:`flush` or
+    :meth:`close`.
+
+    Args:
+        path (str | Path): Log file to create. The index and topic table are
+            written next to it as ``<path>.idx`` and ``<path>.topics``.
+
+    Example::
+        rec = SensorRecorder('run.sblog')
+        rec.record('odom', msg, 'nav_msgs/Odometry')
+        rec.close()
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._topic_ids: dict[str, int] = {}
+        self._topics: list[dict[str, str]] = []
+        self._data = open(self.path, 'wb')
+        self._index = open(f'{self.path}.idx', 'wb')
+        self._data.write(MAGIC)
+        self._offset = len(MAGIC)
+        self._error: Exception | None = None  # First write error, raised by flush()/close().
+        self._writer = threading.Thread(target=self._write_loop, name='sensor-recorder', daemon=True)
+        self._writer.start()
+
+    def record(self, topic: str, msg: dict, ros_type: str = '') -> None:
+        """Queue ``msg`` for writing, stamped with the current time."""
+        self._queue.put((time(), topic, ros_type, msg))
+
+    def flush(self) -> None:
+        """Block until everything queued so far is written to the files."""
+        if self._writer.is_alive():
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait()
+        self._raise_error()
+
+    def close(self) -> None:
+        """Write out everything queued so far and close the files."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        self._data.close()
+        self._index.close()
+        self._raise_error()
+
+    # --------------------------------------------------------------
+    def _raise_error(self) -> None:
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            if isinstance(item, threading.Event):  # flush()
+                self._data.flush()
+                self._index.flush()
+                item.set()
+                continue
+            t, topic, ros_type, msg = item
+            try:
+                self._write(t, topic, ros_type, msg)
+            except Exception as e:
+                logger.warning(f'Failed to record {topic} message: {e}', rate=1.0)
+                if self._error is None:
+                    self._error = e
+        self._data.flush()
+        self._index.flush()
+
+    def _write(self, t: float, topic: str, ros_type: str, msg: Any) -> None:
+        topic_id = self._topic_ids.get(topic)
+        if topic_id is None:
+            topic_id = self._topic_ids[topic] = len(self._topic_ids)
+            info = {'name': topic, 'type': ros_type}
+            self._topics.append(info)
+            self._put(_TOPIC, t, topic_id, json.dumps(info).encode())
+            Path(f'{self.path}.topics').write_text(json.dumps(self._topics))
+
+        payload = pickle.dumps(msg, protocol=pickle.HIGHEST_PROTOCOL)
+        self._index.write(_INDEX_ENTRY.pack(t, self._offset, topic_id))
+        self._put(_MESSAGE, t, topic_id, payload)
+
+    def _put(self, kind: int, t: float, topic_id: int, payload: bytes) -> None:
+        self._data.write(_RECORD.pack(kind, t, topic_id, len(payload)))
+        self._data.write(payload)
+        self._offset += _RECORD.size + len(payload)
+
+
+class SensorLog:
+    """
+    Read a log written by :class:`SensorRecorder`.
+
+    Messages are read from disk one at a time, so iterating an hour-long log
+    keeps memory flat. The index (a small array of times, offsets and topic
+    ids) is the only thing held in memory.
+
+    Args:
+        path (str | Path): Log file written by :class:`SensorRecorder`.
+
+    Example::
+        log = SensorLog('run.sblog')
+        for t, topic, msg in log.read(start=log.start_time + 10, topics=['odom']):
+            ...
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        topics = self._load_topics()
+        self.topic_types: dict[str, str] = {info['name']: info['type'] for info in topics}
+        self._names: list[str] = [info['name'] for info in topics]
+        self.index = self._load_index()
+
+    @property
+    def topics(self) -> list[str]:
+        return list(self._names)
+
+    @property
+    def start_time(self) -> float:
+        return float(self.index['time'][0]) if len(self.index) else 0.0
+
+    @property
+    def end_time(self) -> float:
+        return float(self.index['time'][-1]) if len(self.index) else 0.0
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def count(self, topic: str) -> int:
+        """Number of messages recorded on ``topic``."""
+        if topic not in self._names:
+            return 0
+        return int(np.count_nonzero(self.index['topic'] == self._names.index(topic)))
+
+    def seek(self, t: float) -> int:
+        """Position in :attr:`index` of the first message received at or after ``t``."""
+        return int(np.searchsorted(self.index['time'], t, side='left'))
+
+    def read(
+        self,
+        start: float | None = None,
+        stop: float | None = None,
+        topics: list[str] | None = None,
+    ) -> Iterator[tuple[float, str, dict]]:
+        """Yield ``(recv_time, topic, msg)`` in receive order, optionally limited
+        to ``start <= recv_time < stop`` and to ``topics``."""
+        entries = self.index
+        lo = 0 if start is None else self.seek(start)
+        hi = len(entries) if stop is None else self.seek(stop)
+        entries = entries[lo:hi]
+        if topics is not None:
+            wanted = [self._names.index(name) for name in topics if name in self._names]
+            entries = entries[np.isin(entries['topic'], wanted)]
+
+        with open(self.path, 'rb') as f:
+            for t, offset, topic_id in entries:
+                f.seek(int(offset))
+                _, _, _, size = _RECORD.unpack(f.read(_RECORD.size))
+                yield float(t), self._names[topic_id], pickle.loads(f.read(size))
+
+    # --------------------------------------------------------------
+    def _records(self) -> Iterator[tuple[int, int, float, int, int]]:
+        """Walk the data file: ``(offset, kind, time, topic_id, size)``. Stops at a cut-off record."""
+        with open(self.path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'{self.path} is not a SmartBot sensor log')
+            offset = len(MAGIC)
+            end = f.seek(0, 2)
+            while offset + _RECORD.size <= end:
+                f.seek(offset)
+                kind, t, topic_id, size = _RECORD.unpack(f.read(_RECORD.size))
+                if offset + _RECORD.size + size > end:
+                    break
+                yield offset, kind, t, topic_id, size
+                offset += _RECORD.size + size
+
+    def _load_topics(self) -> list[dict[str, str]]:
+        topics_path = Path(f'{self.path}.topics')
+        if topics_path.exists():
+            return json.loads(topics_path.read_text())
+        # Missing topic table: collect the declarations from the data file.
+        topics = []
+        with open(self.path, 'rb') as f:
+            for offset, kind, _, _, size in self._records():
+                if kind == _TOPIC:
+                    f.seek(offset + _RECORD.size)
+                    topics.append(json.loads(f.read(size)))
+        return topics
+
+    def _load_index(self) -> np.ndarray:
+        idx_path = Path(f'{self.path}.idx')
+        if idx_path.exists():
+            raw = idx_path.read_bytes()
+            index = np.frombuffer(raw[: len(raw) - len(raw) % _INDEX.itemsize], dtype=_INDEX)
+            if len(index) and self._ends_file(index[-1]):
+                return index
+        # Missing index or one that lags the data file: rebuild it from the data file.
+        rows = [(t, off, tid) for off, kind, t, tid, _ in self._records() if kind == _MESSAGE]
+        return np.array(rows, dtype=_INDEX)
+
+    def _ends_file(self, entry: np.void) -> bool:
+        """Whether the record an index entry points at is the last one in the data file."""
+        size = self.path.stat().st_size
+        with open(self.path, 'rb') as f:
+            f.seek(int(entry['offset']))
+            header = f.read(_RECORD.size)
+        if len(header) < _RECORD.size:
+            return False
+        return int(entry['offset']) + _RECORD.size + _RECORD.unpack(header)[3] == size
@@ -0,0 +1,310 @@
+# segments.py
+"""
+On-disk history for :class:`State`. Rows go into an in-memory tail
+:class:`ColumnStore` of ``segment_rows`` rows. When the tail fills up it is
+sealed as a segment and handed to a background thread that writes one ``.npy``
+file per column and then swaps the in-memory arrays for memory-mapped ones.
+The control loop only ever touches the tail, so appends never wait on disk.
+
+Spill directory layout::
+
+    <directory>/seg_00000/columns.json   # {"rows": n, "columns": [[name, file], ...]}
+    <directory>/seg_00000/c0_v0.npy
+    ...
+"""
+
+import atexit
+import contextlib
+import json
+import logging
+import queue
+import threading
+import weakref
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from ..utils import SmartLogger
+from ._columns import _DTYPES, ColumnStore, _fits, _promoted
+
+logger = SmartLogger(level=logging.INFO)
+
+MANIFEST = 'columns.json'
+
+_OPEN_STORES: 'weakref.WeakSet[SegmentedStore]' = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_stores() -> None:
+    # One hook for all stores; the weak set lets unused stores be collected.
+    for store in list(_OPEN_STORES):
+        with contextlib.suppress(Exception):  # Already logged by the writer.
+            store.flush()
+
+
+def _merged(kind: str, other: str | None) -> str:
+    """Kind of a column holding values of ``kind`` and ``other`` (None = missing)."""
+    if other is None:
+        return kind if kind in 'fO' else _promoted(kind, None)
+    if _fits(kind, other):
+        return kind
+    return other if _fits(other, kind) else _promoted(kind, other)
+
+
+class _Segment:
+    """A sealed, fixed-size chunk of rows. ``columns`` is swapped for memmaps once written."""
+
+    def __init__(self, path: Path, n_rows: int, columns: dict[str, np.ndarray]):
+        self.path = path
+        self.n_rows = n_rows
+        self.columns = columns
+        self.version = 0
+
+    def column(self, name: str) -> np.ndarray:
+        col = self.columns.get(name)
+        return np.full(self.n_rows, np.nan) if col is None else col
+
+    def to_frame(self, start: int) -> pd.DataFrame:
+        index = pd.RangeIndex(start, start + self.n_rows)
+        return pd.DataFrame(dict(self.columns), index=index, copy=True)
+
+
+def load_segment(path: str | Path) -> dict[str, np.ndarray]:
+    """
+    Load one segment directory. Numeric columns are memory-mapped read-only;
+    object columns (strings, lists, ...) have to be unpickled into memory.
+    """
+    path = Path(path)
+    manifest = json.loads((path / MANIFEST).read_text())
+    columns = {}
+    for name, fname in manifest['columns']:
+        try:
+            columns[name] = np.load(path / fname, mmap_mode='r')
+        except ValueError:  # Object arrays cannot be memory-mapped.
+            columns[name] = np.load(path / fname, allow_pickle=True)
+    return columns
+
+
+def load_state_log(directory: str | Path) -> pd.DataFrame:
+    """Read every segment spilled by ``State(spill_dir=directory)`` into one DataFrame."""
+    paths = sorted(Path(directory).glob('seg_*'))
+    frames = [pd.DataFrame(dict(load_segment(p)), copy=True) for p in paths]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+class SegmentedStore:
+    """
+    :class:`ColumnStore` look-alike that keeps only the newest rows in RAM.
+
+    Args:
+        directory (str | Path): Where segments are written. Created if missing.
+        segment_rows (int, optional): Rows per segment.
+
+    A segment the writer thread fails to write is logged and stays in memory;
+    the first such error is raised again by :meth:`flush` or :meth:`close`.
+    """
+
+    def __init__(self, directory: str | Path, segment_rows: int = 4096):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_rows = max(int(segment_rows), 1)
+        self.segments: list[_Segment] = []
+        self.tail = ColumnStore(capacity=self.segment_rows)
+        self._sealed_rows = 0
+        self._kinds: dict[str, str] = {}  # Column -> kind across all sealed rows, first seen first.
+
+        self._queue: queue.Queue[_Segment | None] = queue.Queue()
+        self._lock = threading.Lock()  # Guards segment columns against the writer's swap.
+        self._errors: list[Exception] = []  # Write errors of the writer thread, oldest first.
+        # The writer only holds the queue, lock and error list, so an unused store can be
+        # collected; the finalizer then stops the thread.
+        self._writer = threading.Thread(
+            target=self._write_loop,
+            args=(self._queue, self._lock, self._errors),
+            name='state-spill',
+            daemon=True,
+        )
+        self._writer.start()
+        self._stop_writer = weakref.finalize(self, self._queue.put, None)
+        self._stop_writer.atexit = False  # At exit the writer is still needed by _flush_open_stores.
+        self._closed = False
+        _OPEN_STORES.add(self)
+
+    @property
+    def n_rows(self) -> int:
+        return self._sealed_rows + self.tail.n_rows
+
+    @property
+    def total_rows(self) -> int:
+        return self.n_rows
+
+    # --------------------------------------------------------------
+    def append(self, row: dict) -> None:
+        """Append to the in-memory tail, sealing it as a segment once full."""
+        self.tail.append(row)
+        if self.tail.n_rows >= self.segment_rows:
+            self._seal()
+
+    def set_column(self, name: str, value: Any) -> None:
+        """Replace a whole column. Segments already on disk are rewritten in the background."""
+        n = self.n_rows
+        if np.ndim(value) != 0:
+            value = np.asarray(value)
+            if len(value) != n:
+                raise ValueError(f'Column {name!r} needs {n} values, got {len(value)}')
+        start = 0
+        for seg in self.segments:
+            with self._lock:
+                if np.ndim(value) == 0:
+                    seg.columns[name] = np.full(seg.n_rows, value)
+                else:
+                    seg.columns[name] = value[start : start + seg.n_rows]
+                seg.version += 1
+            start += seg.n_rows
+            self._spill(seg)
+        if self.segments:
+            self._kinds[name] = self.segments[0].columns[name].dtype.kind
+        self.tail.set_column(name, value if np.ndim(value) == 0 else value[start:])
+
+    def column(self, name: str, last: int | None = None) -> np.ndarray:
+        """Return column ``name`` across all segments, optionally only the ``last`` rows."""
+        parts = [seg.column(name) for seg in self._segments_for(last)]
+        if name in self.tail.columns:
+            parts.append(self.tail.column(name))
+        else:
+            parts.append(np.full(self.tail.n_rows, np.nan))
+        col = np.concatenate(parts)
+        return col if last is None else col[len(col) - min(max(last, 0), len(col)) :]
+
+    def to_frame(self, last: int | None = None) -> pd.DataFrame:
+        """
+        Return the rows (or only the ``last`` rows) as one DataFrame, oldest first.
+
+        Every part is given the columns and dtypes of the whole store, so the
+        ``last`` rows look exactly like the end of the full frame.
+        """
+        segments = self._segments_for(last)
+        start = self.n_rows - self.tail.n_rows - sum(seg.n_rows for seg in segments)
+        frames = []
+        for seg in segments:
+            frames.append(seg.to_frame(start))
+            start += seg.n_rows
+        frames.append(self.tail.to_frame().set_axis(pd.RangeIndex(start, start + self.tail.n_rows)))
+        kinds = self._store_kinds()
+        dtypes = {name: _DTYPES[kind] for name, kind in kinds.items()}
+        frames = [f.reindex(columns=list(kinds)).astype(dtypes) for f in frames]
+        frame = pd.concat(frames) if len(frames) > 1 else frames[0]
+        return frame if last is None else frame.tail(max(last, 0))
+
+    def flush(self) -> None:
+        """Seal the in-memory tail and block until every segment is on disk."""
+        if self.tail.n_rows:
+            self._seal()
+        self._queue.join()
+        if self._errors:
+            error = self._errors[0]
+            self._errors.clear()
+            raise error
+
+    def close(self) -> None:
+        """Flush and stop the writer thread. Reading (and writing, synchronously) still works."""
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._closed = True
+            self._stop_writer()
+            self._writer.join()
+            _OPEN_STORES.discard(self)
+
+    # --------------------------------------------------------------
+    def _segments_for(self, last: int | None) -> list[_Segment]:
+        """The segments needed to cover the ``last`` rows (all of them if None)."""
+        if last is None:
+            return list(self.segments)
+        need = last - self.tail.n_rows
+        segments = []
+        for seg in reversed(self.segments):
+            if need <= 0:
+                break
+            segments.append(seg)
+            need -= seg.n_rows
+        return segments[::-1]
+
+    def _store_kinds(self) -> dict[str, str]:
+        """Column -> kind over every row, including the in-memory tail."""
+        return self._with_rows(self._kinds, self.tail.columns, self.tail.n_rows)
+
+    def _with_rows(self, kinds: dict[str, str], columns: dict[str, np.ndarray], n: int) -> dict[str, str]:
+        """``kinds`` extended by ``n`` more rows holding ``columns``."""
+        if not n:
+            return kinds
+        merged = {}
+        for name, kind in kinds.items():
+            col = columns.get(name)
+            merged[name] = _merged(kind, None if col is None else col.dtype.kind)
+        for name, col in columns.items():
+            if name not in merged:  # New: missing in the rows before, if any.
+                merged[name] = _merged(col.dtype.kind, None) if self._sealed_rows else col.dtype.kind
+        return merged
+
+    def _seal(self) -> None:
+        tail = self.tail
+        n = tail.n_rows
+        path = self.directory / f'seg_{len(self.segments):05d}'
+        seg = _Segment(path, n, {name: buf[:n] for name, buf in tail.columns.items()})
+        self._kinds = self._with_rows(self._kinds, seg.columns, n)
+        self.segments.append(seg)
+        self._sealed_rows += n
+        self.tail = ColumnStore(capacity=self.segment_rows)
+        self._spill(seg)
+
+    def _spill(self, seg: _Segment) -> None:
+        if self._closed:
+            self._write(seg, self._lock)
+        else:
+            self._queue.put(seg)
+
+    @staticmethod
+    def _write_loop(segments: queue.Queue, lock: threading.Lock, errors: list[Exception]) -> None:
+        while True:
+            seg = segments.get()
+            try:
+                if seg is None:  # Store closed or collected.
+                    return
+                SegmentedStore._write(seg, lock)
+            except Exception as e:
+                logger.warning(f'Failed to spill {seg.path}: {e}')
+                errors.append(e)
+            finally:
+                segments.task_done()
+
+    @staticmethod
+    def _write(seg: _Segment, lock: threading.Lock) -> None:
+        with lock:
+            version = seg.version
+            columns = dict(seg.columns)
+        seg.path.mkdir(exist_ok=True)
+        old = {p for p in seg.path.glob('*.npy')}
+
+        names = []
+        for j, (name, col) in enumerate(columns.items()):
+            fname = f'c{j}_v{version}.npy'
+            np.save(seg.path / fname, np.asarray(col), allow_pickle=col.dtype.kind == 'O')
+            names.append([name, fname])
+        (seg.path / MANIFEST).write_text(json.dumps({'rows': seg.n_rows, 'columns': names}))
+
+        # Swap in the memory-mapped copies unless the columns changed meanwhile.
+        mapped = load_segment(seg.path)
+        with lock:
+            if seg.version != version:
+                return
+            seg.columns = mapped
+        for p in old:
+            with contextlib.suppress(OSError):
+                p.unlink()
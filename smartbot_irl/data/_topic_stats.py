@@ -0,0 +1,132 @@
+# topic_stats.py
+"""
+Arrival bookkeeping per sensor topic: when the latest message was stamped on
+the robot (``header.stamp``), when it arrived here, how many have arrived,
+and the rate and jitter of recent arrivals.
+
+Receivers keep one :class:`TopicStats` per SensorData field and attach the
+:class:`TopicStamp` of the latest message to ``SensorData.stamps``, so the
+stamps travel with snapshots.
+"""
+
+from time import time
+from typing import NamedTuple
+
+import numpy as np
+
+
+class TopicStamp(NamedTuple):
+    """
+    Provenance of the latest message of one topic.
+
+    Attributes:
+        stamp (float | None): ``header.stamp`` in seconds (robot clock), or
+            None if the message has no header.
+        receive_time (float): ``time.time()`` when it arrived here.
+        count (int): Messages received on the topic so far, this one included.
+    """
+
+    stamp: float | None
+    receive_time: float
+    count: int
+
+    def age(self, now: float | None = None) -> float:
+        """Seconds since the message arrived."""
+        return (time() if now is None else now) - self.receive_time
+
+    @property
+    def latency(self) -> float | None:
+        """Seconds from the robot stamping the message to it arriving here.
+
+        Only meaningful when the robot and this machine have synchronized clocks.
+        """
+        return None if self.stamp is None else self.receive_time - self.stamp
+
+
+def header_stamp(msg: dict) -> float | None:
+    """``header.stamp`` of a rosbridge dict in seconds (ROS 2 or ROS 1 field names)."""
+    header = msg.get('header')
+    if not header:
+        return None
+    stamp = header.get('stamp')
+    if not stamp:
+        return None
+    sec = stamp.get('sec', stamp.get('secs'))
+    if sec is None:
+        return None
+    return sec + stamp.get('nanosec', stamp.get('nsecs', 0)) * 1e-9
+
+
+class TopicStats:
+    """
+    Counters, age, rate and jitter of one topic.
+
+    :meth:`record` is cheap enough to call from subscription callbacks: it
+    writes the receive time into a small ring buffer. Rates and jitter are
+    computed from that buffer only when asked for.
+
+    Args:
+        window (int): Number of recent arrivals used for :meth:`rate` and
+            :meth:`jitter`.
+
+    Example::
+        stats = bot.topic_stats['scan']
+        if stats.age() > 0.5:
+            print(f'scan is stale ({stats.rate():.1f} Hz, jitter {stats.jitter() * 1e3:.1f} ms)')
+    """
+
+    __slots__ = ('count', 'last', '_times', '_window')
+
+    def __init__(self, window: int = 50):
+        if window < 2:
+            raise ValueError('window must be >= 2')
+        self.count = 0
+        self.last: TopicStamp | None = None
+        self._times = [0.0] * window
+        self._window = window
+
+    def record(self, msg: dict | None = None, receive_time: float | None = None) -> TopicStamp:
+        """Count one arrival of ``msg`` (a rosbridge dict) and return its stamp."""
+        t = time() if receive_time is None else receive_time
+        self._times[self.count % self._window] = t
+        self.count += 1
+        self.last = TopicStamp(None if msg is None else header_stamp(msg), t, self.count)
+        return self.last
+
+    def age(self, now: float | None = None) -> float:
+        """Seconds since the latest arrival (inf if nothing arrived yet)."""
+        return float('inf') if self.last is None else self.last.age(now)
+
+    def intervals(self) -> np.ndarray:
+        """Recent inter-arrival times in seconds, oldest first."""
+        n = min(self.count, self._window)
+        if n < 2:
+            return np.empty(0)
+        i = self.count % self._window
+        times = self._times[i:] + self._times[:i]
+        return np.diff(times[-n:])
+
+    def rate(self) -> float:
+        """Effective rate of recent arrivals in Hz (0 with fewer than two)."""
+        gaps = self.intervals()
+        span = float(gaps.sum())
+        return len(gaps) / span if span > 0 else 0.0
+
+    def jitter(self) -> float:
+        """Standard deviation of recent inter-arrival times in seconds."""
+        gaps = self.intervals()
+        return float(gaps.std()) if len(gaps) else 0.0
+
+    def summary(self, now: float | None = None) -> dict:
+        """Everything above as a dict (handy for logging)."""
+        last = self.last
+        return {
+            'count': self.count,
+            'age': self.age(now),
+            'rate': self.rate(),
+            'jitter': self.jitter(),
+            'latency': None if last is None else last.latency,
+        }
+
+    def __repr__(self) -> str:
+        return f'TopicStats(count={self.count}, age={self.age():.3f}s, rate={self.rate():.1f}Hz)'
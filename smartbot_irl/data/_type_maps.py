@@ -1,14 +1,121 @@
 # smartbot_irl/data/type_maps.py
 from __future__ import annotations
-from dataclasses import dataclass, field
-from typing import Any, List, Dict
-from scipy.spatial.transform import Rotation as R
+import math
+from dataclasses import dataclass, field, fields
+from collections.abc import Sequence
+from typing import Any, Iterable, Iterator, List, Dict
 import numpy as np
 
+from ._decoders import RosField, decoder_for, register_message, row_decoder_for
+
+
+# ------------------------------------------------------------
+# Quaternion -> roll pitch yaw
+# ------------------------------------------------------------
+# |sin(pitch)| at or above 1 - _GIMBAL_EPS counts as gimbal lock (pitch = +-90 deg).
+_GIMBAL_EPS = 1e-12
+
+def quat_to_euler(qx: float, qy: float, qz: float, qw: float) -> tuple[float, float, float]:
+    """
+    Convert one quaternion to roll, pitch, yaw in radians.
+
+    Closed-form equivalent of
+    ``Rotation.from_quat([qx, qy, qz, qw]).as_euler('xyz')`` (extrinsic x-y-z)
+    without building NumPy arrays or a scipy ``Rotation``. The quaternion does
+    not need to be normalized. A zero quaternion gives ``(0, 0, 0)``.
+
+    At gimbal lock (pitch of +-90 deg) roll and yaw turn about the same axis;
+    like scipy, yaw is then 0 and roll holds the whole rotation.
+    """
+    n2 = qx * qx + qy * qy + qz * qz + qw * qw
+    if n2 == 0.0:
+        return 0.0, 0.0, 0.0
+    sinp = 2.0 * (qw * qy - qz * qx) / n2
+    if abs(sinp) >= 1.0 - _GIMBAL_EPS:
+        return math.remainder(2.0 * math.atan2(qx, qw), math.tau), math.copysign(math.pi / 2, sinp), 0.0
+    roll = math.atan2(2.0 * (qw * qx + qy * qz), qw * qw - qx * qx - qy * qy + qz * qz)
+    pitch = math.asin(-1.0 if sinp < -1.0 else 1.0 if sinp > 1.0 else sinp)
+    yaw = math.atan2(2.0 * (qw * qz + qx * qy), qw * qw + qx * qx - qy * qy - qz * qz)
+    return roll, pitch, yaw
+
+
+def quats_to_euler(q: np.ndarray) -> np.ndarray:
+    """
+    Vectorized :func:`quat_to_euler`: an ``(N, 4)`` array of ``[qx, qy, qz, qw]``
+    rows becomes an ``(N, 3)`` array of ``[roll, pitch, yaw]`` rows.
+    """
+    q = np.asarray(q, dtype=np.float64).reshape(-1, 4)
+    qx, qy, qz, qw = q.T
+    n2 = np.einsum('ij,ij->i', q, q)
+    n2[n2 == 0.0] = 1.0  # Zero quaternions give zero angles.
+    out = np.empty((len(q), 3))
+    sinp = np.clip(2.0 * (qw * qy - qz * qx) / n2, -1.0, 1.0)
+    np.arctan2(2.0 * (qw * qx + qy * qz), qw * qw - qx * qx - qy * qy + qz * qz, out=out[:, 0])
+    np.arcsin(sinp, out=out[:, 1])
+    np.arctan2(2.0 * (qw * qz + qx * qy), qw * qw + qx * qx - qy * qy - qz * qz, out=out[:, 2])
+    lock = np.abs(sinp) >= 1.0 - _GIMBAL_EPS
+    if lock.any():
+        roll = 2.0 * np.arctan2(qx[lock], qw[lock])
+        out[lock, 0] = np.remainder(roll + np.pi, 2.0 * np.pi) - np.pi
+        out[lock, 1] = np.copysign(np.pi / 2, sinp[lock])
+        out[lock, 2] = 0.0
+    return out
+
+
+class _EulerAngle:
+    """
+    Roll, pitch or yaw of a class with ``qx``/``qy``/``qz``/``qw`` fields.
+
+    Computed from the quaternion on first read and cached per instance; the
+    cache remembers the quaternion it came from, so changing any component
+    invalidates it. Assigning a value overrides the angle until the quaternion
+    next changes, and assigning ``None`` goes back to the computed one.
+    """
+
+    def __init__(self, axis: int):
+        self.axis = axis
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return None  # Dataclass default: derive from the quaternion.
+        return _euler_cache(obj)[1][self.axis]
+
+    def __set__(self, obj, value) -> None:
+        if value is None and getattr(obj, '_euler', None) is None:
+            return
+        key, angles = _euler_cache(obj)
+        angles = list(angles)
+        angles[self.axis] = quat_to_euler(*key)[self.axis] if value is None else value
+        obj._euler = (key, tuple(angles))
+
+
+def _euler_cache(obj) -> tuple[tuple, tuple]:
+    """``(quaternion, (roll, pitch, yaw))`` of ``obj``, recomputed if the quaternion changed."""
+    key = (obj.qx, obj.qy, obj.qz, obj.qw)
+    cached = getattr(obj, '_euler', None)
+    if cached is None or cached[0] != key:
+        cached = obj._euler = (key, quat_to_euler(*key))
+    return cached
+
+
+def _slotted(cls: type) -> type:
+    """
+    Rebuild a dataclass with ``__slots__``, like ``dataclass(slots=True)``, but
+    keep its :class:`_EulerAngle` fields as descriptors (the stdlib version
+    would turn them into plain slots). Adds an ``_euler`` slot for their cache.
+    """
+    names = tuple(f.name for f in fields(cls) if not isinstance(cls.__dict__.get(f.name), _EulerAngle))
+    body = {k: v for k, v in cls.__dict__.items() if k not in names and k not in ('__dict__', '__weakref__')}
+    body['__slots__'] = names + ('_euler',)
+    slotted = type(cls)(cls.__name__, cls.__bases__, body)
+    slotted.__qualname__ = cls.__qualname__
+    return slotted
+
 
 # ------------------------------------------------------------
 # Geometry and Basic Pose Types
 # ------------------------------------------------------------
+@_slotted
 @dataclass
 class Pose:
     """
@@ -29,9 +136,21 @@ class Pose:
         roll (float): Roll angle in radians.
         pitch (float): Pitch angle in radians.
         yaw (float): Yaw angle in radians.
+
+    The RPY angles are computed from the quaternion on first access and
+    cached until the quaternion changes. Pass or assign them to override.
     """
 
     ros_type = 'geometry_msgs/Pose'
+    ros_fields = {
+        'x': 'position.x',
+        'y': 'position.y',
+        'z': 'position.z',
+        'qx': 'orientation.x',
+        'qy': 'orientation.y',
+        'qz': 'orientation.z',
+        'qw': 'orientation.w',
+    }
 
     x: float = 0.0
     y: float = 0.0
@@ -40,18 +159,18 @@ class Pose:
     qy: float = 0.0
     qz: float = 0.0
     qw: float = 1.0
-    roll: float = 0.0
-    pitch: float = 0.0
-    yaw: float = 0.0
+    roll: float | None = _EulerAngle(0)
+    pitch: float | None = _EulerAngle(1)
+    yaw: float | None = _EulerAngle(2)
 
     @classmethod
     def from_ros(cls, msg: dict) -> Pose:
         """
         Create a ``Pose`` from a ROS ``geometry_msgs/Pose`` msg.
 
-        The method extracts the ``position`` and ``orientation`` fields,
-        converts the quaternion to roll–pitch–yaw using
-        ``scipy.spatial.transform.Rotation``, and returns a populated ``Pose``.
+        The ``position`` and ``orientation`` fields are read by the decoder
+        compiled from ``ros_fields``. Roll–pitch–yaw are left to be computed
+        on first access.
 
         Parameters
         ----------
@@ -62,29 +181,7 @@ class Pose:
         -------
             Pose: Parsed pose instance.
         """
-        pos = msg.get('position', {})
-        ori = msg.get('orientation', {})
-        q = np.array(
-            [
-                ori.get('x', 0.0),
-                ori.get('y', 0.0),
-                ori.get('z', 0.0),
-                ori.get('w', 1.0),
-            ]
-        )
-        roll, pitch, yaw = R.from_quat(q).as_euler('xyz', degrees=False)
-        return cls(
-            x=pos.get('x', 0.0),
-            y=pos.get('y', 0.0),
-            z=pos.get('z', 0.0),
-            qx=q[0],
-            qy=q[1],
-            qz=q[2],
-            qw=q[3],
-            roll=roll,
-            pitch=pitch,
-            yaw=yaw,
-        )
+        return decoder_for(cls)(msg)
 
     # TODO convert RPY back to quat?
     def to_ros(self) -> dict[str, dict[str, float]]:
@@ -110,9 +207,25 @@ class Pose:
 
 
 # ------------------------------------------------------------
+@_slotted
 @dataclass
 class Odometry:
     ros_type = 'nav_msgs/Odometry'
+    ros_fields = {
+        'x': 'pose.pose.position.x',
+        'y': 'pose.pose.position.y',
+        'z': 'pose.pose.position.z',
+        'qx': 'pose.pose.orientation.x',
+        'qy': 'pose.pose.orientation.y',
+        'qz': 'pose.pose.orientation.z',
+        'qw': 'pose.pose.orientation.w',
+        'vx': 'twist.twist.linear.x',
+        'vy': 'twist.twist.linear.y',
+        'vz': 'twist.twist.linear.z',
+        'wx': 'twist.twist.angular.x',
+        'wy': 'twist.twist.angular.y',
+        'wz': 'twist.twist.angular.z',
+    }
 
     x: float = 0.0
     y: float = 0.0
@@ -121,9 +234,9 @@ class Odometry:
     qy: float = 0.0
     qz: float = 0.0
     qw: float = 1.0
-    roll: float = 0.0
-    pitch: float = 0.0
-    yaw: float = 0.0
+    roll: float | None = _EulerAngle(0)
+    pitch: float | None = _EulerAngle(1)
+    yaw: float | None = _EulerAngle(2)
     vx: float = 0.0
     vy: float = 0.0
     vz: float = 0.0
@@ -133,41 +246,7 @@ class Odometry:
 
     @classmethod
     def from_ros(cls, msg: dict):
-        pose = msg.get('pose', {}).get('pose', {})
-        pos = pose.get('position', {})
-        ori = pose.get('orientation', {})
-        q = np.array(
-            [
-                ori.get('x', 0.0),
-                ori.get('y', 0.0),
-                ori.get('z', 0.0),
-                ori.get('w', 1.0),
-            ]
-        )
-        roll, pitch, yaw = R.from_quat(q).as_euler('xyz', degrees=False)
-
-        twist = msg.get('twist', {}).get('twist', {})
-        lin = twist.get('linear', {})
-        ang = twist.get('angular', {})
-
-        return cls(
-            x=pos.get('x', 0.0),
-            y=pos.get('y', 0.0),
-            z=pos.get('z', 0.0),
-            qx=q[0],
-            qy=q[1],
-            qz=q[2],
-            qw=q[3],
-            roll=roll,
-            pitch=pitch,
-            yaw=yaw,
-            vx=lin.get('x', 0.0),
-            vy=lin.get('y', 0.0),
-            vz=lin.get('z', 0.0),
-            wx=ang.get('x', 0.0),
-            wy=ang.get('y', 0.0),
-            wz=ang.get('z', 0.0),
-        )
+        return decoder_for(cls)(msg)
 
     def to_ros(self):
         return {
@@ -187,42 +266,268 @@ class Odometry:
 
 
 # ------------------------------------------------------------
+POSE_COLUMNS = ('x', 'y', 'z', 'qx', 'qy', 'qz', 'qw', 'roll', 'pitch', 'yaw')
+
+
+def _column_property(j: int) -> property:
+    def get(self) -> float:
+        return float(self._row[j])
+
+    def set(self, value: float) -> None:
+        row = self._row
+        row[j] = value
+        if 3 <= j < 7:  # Quaternion changed: keep the row's RPY in step.
+            row[7:10] = quat_to_euler(*row[3:7].tolist())
+
+    return property(get, set)
+
+
+class PoseView:
+    """
+    :class:`Pose`-like view of one row of a :class:`PoseList`.
+
+    Reads and writes go straight to the underlying array, so nothing is copied
+    per pose. Use :meth:`to_pose` for a standalone ``Pose``.
+    """
+
+    __slots__ = ('_row',)
+
+    def __init__(self, row: np.ndarray):
+        self._row = row
+
+    def to_pose(self) -> Pose:
+        return Pose(*self._row.tolist())
+
+    def to_ros(self) -> dict[str, dict[str, float]]:
+        x, y, z, qx, qy, qz, qw = self._row[:7].tolist()
+        return {
+            'position': {'x': x, 'y': y, 'z': z},
+            'orientation': {'x': qx, 'y': qy, 'z': qz, 'w': qw},
+        }
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (Pose, PoseView)):
+            return all(getattr(self, c) == getattr(other, c) for c in POSE_COLUMNS)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        values = ', '.join(f'{c}={v!r}' for c, v in zip(POSE_COLUMNS, self._row.tolist()))
+        return f'PoseView({values})'
+
+
+for _j, _name in enumerate(POSE_COLUMNS):
+    setattr(PoseView, _name, _column_property(_j))
+
+
+class PoseList(Sequence):
+    """
+    Sequence of poses stored as one ``(N, 10)`` float array.
+
+    Columns follow :data:`POSE_COLUMNS`. Indexing yields :class:`PoseView` rows
+    (slices yield another ``PoseList``), so code written for a ``list[Pose]``
+    keeps working, while :attr:`data` allows whole-array operations. Decoded
+    lists fill the RPY columns (one vectorized call) the first time ``data``
+    is read.
+    """
+
+    __slots__ = ('_data', '_rpy_stale')
+
+    def __init__(self, data: np.ndarray | None = None, rpy_stale: bool = False):
+        self._data = np.zeros((0, len(POSE_COLUMNS))) if data is None else data
+        self._rpy_stale = rpy_stale
+
+    @property
+    def data(self) -> np.ndarray:
+        if self._rpy_stale:
+            self._data[:, 7:] = quats_to_euler(self._data[:, 3:7])
+            self._rpy_stale = False
+        return self._data
+
+    @data.setter
+    def data(self, value: np.ndarray) -> None:
+        self._data = value
+        self._rpy_stale = False
+
+    @classmethod
+    def from_poses(cls, poses: Iterable[Pose | PoseView]) -> PoseList:
+        rows = [[getattr(p, c) for c in POSE_COLUMNS] for p in poses]
+        return cls(np.array(rows, dtype=np.float64).reshape(-1, len(POSE_COLUMNS)))
+
+    @classmethod
+    def from_ros(cls, msgs: list[dict]) -> PoseList:
+        """Parse a list of ``geometry_msgs/Pose`` dicts. RPY is filled in lazily."""
+        data = np.empty((len(msgs), len(POSE_COLUMNS)))
+        if msgs:
+            row = row_decoder_for(Pose, POSE_COLUMNS[:7])  # Same spec as Pose.from_ros.
+            flat = []
+            extend = flat.extend
+            for p in msgs:
+                extend(row(p))
+            data[:, :7] = np.array(flat).reshape(-1, 7)
+        return cls(data, rpy_stale=bool(msgs))
+
+    def to_ros(self) -> list[dict]:
+        return [
+            {
+                'position': {'x': x, 'y': y, 'z': z},
+                'orientation': {'x': qx, 'y': qy, 'z': qz, 'w': qw},
+            }
+            for x, y, z, qx, qy, qz, qw in self._data[:, :7].tolist()
+        ]
+
+    def to_list(self) -> list[Pose]:
+        """Standalone ``Pose`` copies of every row."""
+        return [Pose(*row) for row in self.data.tolist()]
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return PoseList(self.data[i])
+        return PoseView(self.data[i])
+
+    def __iter__(self) -> Iterator[PoseView]:
+        for row in self.data:
+            yield PoseView(row)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PoseList):
+            return np.array_equal(self.data, other.data)
+        if isinstance(other, (list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f'PoseList({list(self)!r})'
+
+
 @dataclass
 class PoseArray:
+    """
+    Maps to ROS2 message ``geometry_msgs/PoseArray``.
+
+    Poses are stored struct-of-arrays in a :class:`PoseList`. Iterate
+    ``poses`` for per-pose :class:`PoseView` objects, or work on all of them at
+    once through :attr:`array`, :attr:`xy` and :attr:`yaw`.
+
+    Example::
+        near = markers.xy[np.hypot(*markers.xy.T) < 1.0]
+        closest = markers.filter(np.argmin(np.hypot(*markers.xy.T)))
+    """
+
     ros_type = 'geometry_msgs/PoseArray'
-    poses: List[Pose] = field(default_factory=list)
+    ros_fields = {'poses': RosField('poses', convert=PoseList.from_ros)}
+    poses: PoseList = field(default_factory=PoseList)
+
+    def __post_init__(self):
+        if not isinstance(self.poses, PoseList):
+            self.poses = PoseList.from_poses(self.poses)
 
     @classmethod
     def from_ros(cls, msg: dict):
-        poses = [Pose.from_ros(p) for p in msg.get('poses', [])]
-        return cls(poses=poses)
+        return decoder_for(cls)(msg)
+
+    @classmethod
+    def from_xy(cls, xy, yaw=None, **kwargs):
+        """Build from an ``(N, 2)`` array of planar positions and optional headings."""
+        xy = np.asarray(xy, dtype=np.float64).reshape(-1, 2)
+        data = np.zeros((len(xy), len(POSE_COLUMNS)))
+        data[:, :2] = xy
+        data[:, 6] = 1.0
+        if yaw is not None:
+            data[:, 5] = np.sin(np.multiply(yaw, 0.5))
+            data[:, 6] = np.cos(np.multiply(yaw, 0.5))
+            data[:, 9] = yaw
+        return cls(poses=PoseList(data), **kwargs)
 
     def to_ros(self):
-        return {'poses': [p.to_ros() for p in self.poses]}
+        return {'poses': self.poses.to_ros()}
+
+    @property
+    def array(self) -> np.ndarray:
+        """``(N, 10)`` array of every pose, columns as in :data:`POSE_COLUMNS`."""
+        return self.poses.data
+
+    @property
+    def xy(self) -> np.ndarray:
+        """``(N, 2)`` view of the positions."""
+        return self.poses.data[:, :2]
+
+    @property
+    def yaw(self) -> np.ndarray:
+        """``(N,)`` view of the headings in radians."""
+        return self.poses.data[:, 9]
+
+    def filter(self, index) -> PoseArray:
+        """Poses selected by a boolean mask, an index array or an int."""
+        return type(self)(poses=PoseList(self.poses.data[np.atleast_1d(index)]))
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.poses == other.poses
 
 
 # ------------------------------------------------------------
-@dataclass
-class ArucoMarkers:
+@dataclass(eq=False)
+class ArucoMarkers(PoseArray):
+    """
+    Maps to ``ros2_aruco_interfaces/ArucoMarkers``: a :class:`PoseArray` plus
+    an int64 array of ``marker_ids``, one per pose.
+
+    Example::
+        hex48 = bot.read().seen_hexes.by_id(48)
+        if len(hex48.poses):
+            x, y = hex48.xy[0]
+    """
+
     ros_type = 'ros2_aruco_interfaces/ArucoMarkers'
-    poses: List[Pose] = field(default_factory=list)
-    marker_ids: List[int] = field(default_factory=list)
+    ros_fields = {
+        'poses': RosField('poses', convert=PoseList.from_ros),
+        'marker_ids': 'marker_ids',
+    }
+    poses: PoseList = field(default_factory=PoseList)
+    marker_ids: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
 
-    @classmethod
-    def from_ros(cls, msg: dict):
-        poses = [Pose.from_ros(p) for p in msg.get('poses', [])]
-        marker_ids = list(msg.get('marker_ids', []))
-        return cls(poses=poses, marker_ids=marker_ids)
+    def __post_init__(self):
+        super().__post_init__()
+        self.marker_ids = np.asarray(self.marker_ids, dtype=np.int64).reshape(-1)
 
     def to_ros(self) -> dict[str, Any]:
         return {
-            'poses': [p.to_ros() for p in self.poses],
-            'marker_ids': list(self.marker_ids),
+            'poses': self.poses.to_ros(),
+            'marker_ids': self.marker_ids.tolist(),
         }
 
+    def filter(self, index) -> ArucoMarkers:
+        index = np.atleast_1d(index)
+        return type(self)(poses=PoseList(self.poses.data[index]), marker_ids=self.marker_ids[index])
+
+    def by_id(self, marker_id: int | Iterable[int]) -> ArucoMarkers:
+        """Only the detections of ``marker_id`` (or of any id in a list of them)."""
+        return self.filter(np.isin(self.marker_ids, marker_id))
+
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.poses == other.poses and np.array_equal(self.marker_ids, other.marker_ids)
+
+
+def _float32_array(values) -> np.ndarray:
+    """Ranges as float32 (arrays from the binary transports are used as they are)."""
+    try:
+        return np.asarray(values, dtype=np.float32)
+    except TypeError:  # JSON null for missing readings.
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float32)
+
+
+def _as_list(values) -> list:
+    return values.tolist() if isinstance(values, np.ndarray) else values
+
 
 # ------------------------------------------------------------
-@dataclass
+@dataclass(slots=True)
 class LaserScan:
     """
     Represents a 2D planar laser scan message.
@@ -235,9 +540,9 @@ class LaserScan:
     ros_type : str
         The ROS message type string (`"sensor_msgs/LaserScan"`).
 
-    ranges : list of float
+    ranges : numpy.ndarray of float32
         Range readings from the laser in meters. Each value corresponds to a
-        beam.
+        beam. Missing readings (``null`` in JSON) become NaN.
 
     angle_min : float
         Start angle of the scan, in radians (usually negative).
@@ -250,58 +555,87 @@ class LaserScan:
     """
 
     ros_type = 'sensor_msgs/LaserScan'
-
-    ranges: List[float] = field(default_factory=list)
+    ros_fields = {
+        'ranges': RosField('ranges', convert=_float32_array),
+        'angle_min': 'angle_min',
+        'angle_max': 'angle_max',
+        'angle_increment': 'angle_increment',
+    }
+
+    ranges: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float32))
     angle_min: float = 0.0
     angle_max: float = 0.0
     angle_increment: float = 0.0
 
     @classmethod
     def from_ros(cls, msg: dict):
-        return cls(
-            ranges=msg.get('ranges', []),
-            angle_min=msg.get('angle_min', 0.0),
-            angle_max=msg.get('angle_max', 0.0),
-            angle_increment=msg.get('angle_increment', 0.0),
-        )
+        return decoder_for(cls)(msg)
 
     def to_ros(self):
         return {
-            'ranges': self.ranges,
+            'ranges': _as_list(self.ranges),
             'angle_min': self.angle_min,
             'angle_max': self.angle_max,
             'angle_increment': self.angle_increment,
         }
 
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return (self.angle_min, self.angle_max, self.angle_increment) == (
+            other.angle_min,
+            other.angle_max,
+            other.angle_increment,
+        ) and np.array_equal(self.ranges, other.ranges, equal_nan=True)
+
 
 # ------------------------------------------------------------
-@dataclass
+@dataclass(slots=True)
 class JointState:
     ros_type = 'sensor_msgs/JointState'
+    ros_fields = {'names': 'name', 'positions': 'position', 'velocities': 'velocity'}
     names: List[str] = field(default_factory=list)
     positions: List[float] = field(default_factory=list)
     velocities: List[float] = field(default_factory=list)
 
     @classmethod
     def from_ros(cls, msg: dict):
-        return cls(
-            names=msg.get('name', []),
-            positions=msg.get('position', []),
-            velocities=msg.get('velocity', []),
-        )
+        return decoder_for(cls)(msg)
 
     def to_ros(self):
         return {
             'name': self.names,
-            'position': self.positions,
-            'velocity': self.velocities,
+            'position': _as_list(self.positions),
+            'velocity': _as_list(self.velocities),
         }
 
+    def __eq__(self, other) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return (
+            list(self.names) == list(other.names)
+            and np.array_equal(self.positions, other.positions)
+            and np.array_equal(self.velocities, other.velocities)
+        )
+
 
 # ------------------------------------------------------------
+@_slotted
 @dataclass
 class IMU:
     ros_type = 'sensor_msgs/Imu'
+    ros_fields = {
+        'qx': 'orientation.x',
+        'qy': 'orientation.y',
+        'qz': 'orientation.z',
+        'qw': 'orientation.w',
+        'wx': 'angular_velocity.x',
+        'wy': 'angular_velocity.y',
+        'wz': 'angular_velocity.z',
+        'ax': 'linear_acceleration.x',
+        'ay': 'linear_acceleration.y',
+        'az': 'linear_acceleration.z',
+    }
 
     # Orientation quaternion
     qx: float = 0.0
@@ -309,10 +643,10 @@ class IMU:
     qz: float = 0.0
     qw: float = 1.0
 
-    # Euler orientation
-    roll: float = 0.0
-    pitch: float = 0.0
-    yaw: float = 0.0
+    # Euler orientation, derived from the quaternion on first access
+    roll: float | None = _EulerAngle(0)
+    pitch: float | None = _EulerAngle(1)
+    yaw: float | None = _EulerAngle(2)
 
     # Angular velocity
     wx: float = 0.0
@@ -326,36 +660,7 @@ class IMU:
 
     @classmethod
     def from_ros(cls, msg: dict):
-        ori = msg.get('orientation', {})
-        ang = msg.get('angular_velocity', {})
-        acc = msg.get('linear_acceleration', {})
-
-        q = np.array(
-            [
-                ori.get('x', 0.0),
-                ori.get('y', 0.0),
-                ori.get('z', 0.0),
-                ori.get('w', 1.0),
-            ]
-        )
-
-        roll, pitch, yaw = R.from_quat(q).as_euler('xyz', degrees=False)
-
-        return cls(
-            qx=q[0],
-            qy=q[1],
-            qz=q[2],
-            qw=q[3],
-            roll=roll,
-            pitch=pitch,
-            yaw=yaw,
-            wx=ang.get('x', 0.0),
-            wy=ang.get('y', 0.0),
-            wz=ang.get('z', 0.0),
-            ax=acc.get('x', 0.0),
-            ay=acc.get('y', 0.0),
-            az=acc.get('z', 0.0),
-        )
+        return decoder_for(cls)(msg)
 
     def to_ros(self):
         return {
@@ -382,11 +687,12 @@ class IMU:
 @dataclass
 class Bool:
     ros_type = 'std_msgs/Bool'
+    ros_fields = {'data': 'data'}
     data: bool = False
 
     @classmethod
     def from_ros(cls, msg: dict):
-        return cls(data=msg.get('data', False))
+        return decoder_for(cls)(msg)
 
     def to_ros(self):
         return {'data': self.data}
@@ -396,11 +702,16 @@ class Bool:
 @dataclass
 class String:
     ros_type = 'std_msgs/String'
+    ros_fields = {'data': 'data'}
     data: str = ''
 
     @classmethod
     def from_ros(cls, msg: dict):
-        return cls(data=msg.get('data', ''))
+        return decoder_for(cls)(msg)
 
     def to_ros(self):
         return {'data': self.data}
+
+
+for _cls in (Pose, Odometry, PoseArray, ArucoMarkers, LaserScan, JointState, IMU, Bool, String):
+    register_message(_cls)
@@ -0,0 +1,151 @@
+# vector.py
+"""
+Pack SensorData into fixed-layout float vectors for learned controllers and
+datasets. The layout (which value goes in which slot) is worked out once in
+:class:`VectorLayout`; packing then only copies numbers into a preallocated
+buffer, always in the same order.
+"""
+
+from dataclasses import fields
+from operator import attrgetter
+from typing import TYPE_CHECKING, Callable, Iterable
+
+import numpy as np
+
+from ._type_maps import IMU, Odometry
+
+if TYPE_CHECKING:
+    from ._data import SensorData
+
+_SCALAR_GROUPS = {'odom': Odometry, 'imu': IMU}
+
+
+class VectorLayout:
+    """
+    Fixed order of numeric SensorData values.
+
+    Args:
+        odom (bool | list[str], optional): Odometry fields to include. ``True``
+            takes every field of :class:`Odometry`.
+        imu (bool | list[str], optional): IMU fields to include, as for ``odom``.
+        scan (int, optional): Number of laser ranges. Scans with a different
+            beam count are resampled to ``scan`` evenly spaced beams.
+        joints (int, optional): Number of joints; packs their positions then
+            their velocities, padding missing joints with 0.
+        scan_max (float, optional): If given, inf/NaN and longer ranges are
+            replaced by this value (handy for learned models).
+        dtype (optional): Element type of the vectors.
+
+    Example::
+        layout = VectorLayout(odom=['x', 'y', 'yaw'], scan=360, joints=2)
+        buf = np.empty(layout.size)
+        layout.pack(bot.read(), out=buf)
+
+        dataset = np.empty((n_steps, layout.size))
+        layout.pack_batch(bot.read(), dataset, k)
+    """
+
+    def __init__(
+        self,
+        odom: bool | Iterable[str] = True,
+        imu: bool | Iterable[str] = False,
+        scan: int = 0,
+        joints: int = 0,
+        scan_max: float | None = None,
+        dtype=np.float64,
+    ):
+        self.dtype = np.dtype(dtype)
+        self.names: list[str] = []
+        self._parts: list[Callable[['SensorData', np.ndarray], None]] = []
+        self._resample_idx: dict[int, np.ndarray] = {}
+
+        for group, spec in (('odom', odom), ('imu', imu)):
+            if spec:
+                attrs = [f.name for f in fields(_SCALAR_GROUPS[group])] if spec is True else list(spec)
+                self._add_scalars(group, attrs)
+        if scan:
+            self._add_scan(scan, scan_max)
+        if joints:
+            self._add_joints(joints)
+
+    @property
+    def size(self) -> int:
+        return len(self.names)
+
+    def pack(self, data: 'SensorData', out: np.ndarray | None = None) -> np.ndarray:
+        """Write ``data`` into ``out`` (a 1-D buffer of :attr:`size`) and return it."""
+        if out is None:
+            out = np.empty(self.size, dtype=self.dtype)
+        for part in self._parts:
+            part(data, out)
+        return out
+
+    def pack_batch(self, data: 'SensorData', batch: np.ndarray, k: int) -> np.ndarray:
+        """Write ``data`` into row ``k`` of a 2-D ``batch`` array and return the batch."""
+        self.pack(data, out=batch[k])
+        return batch
+
+    # --------------------------------------------------------------
+    def _add_scalars(self, group: str, attrs: list[str]) -> None:
+        start, stop = self.size, self.size + len(attrs)
+        self.names += [f'{group}_{a}' for a in attrs]
+        get_msg = attrgetter(group)
+        get_vals = attrgetter(*attrs)
+
+        if len(attrs) == 1:
+
+            def part(data, out):
+                out[start] = get_vals(get_msg(data))
+
+        else:
+
+            def part(data, out):
+                out[start:stop] = get_vals(get_msg(data))
+
+        self._parts.append(part)
+
+    def _add_scan(self, n: int, scan_max: float | None) -> None:
+        start, stop = self.size, self.size + n
+        self.names += [f'scan_{i}' for i in range(n)]
+
+        def part(data, out):
+            seg = out[start:stop]
+            ranges = data.scan.ranges
+            m = len(ranges)
+            if m == n:
+                seg[:] = ranges
+            elif m == 0:
+                seg.fill(np.inf if scan_max is None else scan_max)
+            else:
+                np.take(np.asarray(ranges, dtype=seg.dtype), self._resample(m, n), out=seg)
+            if scan_max is not None:
+                np.nan_to_num(seg, copy=False, nan=scan_max, posinf=scan_max)
+                np.minimum(seg, scan_max, out=seg)
+
+        self._parts.append(part)
+
+    def _add_joints(self, n: int) -> None:
+        start = self.size
+        self.names += [f'joints_positions_{i}' for i in range(n)]
+        self.names += [f'joints_velocities_{i}' for i in range(n)]
+
+        def part(data, out):
+            joints = data.joints
+            _fit(joints.positions, out[start : start + n])
+            _fit(joints.velocities, out[start + n : start + 2 * n])
+
+        self._parts.append(part)
+
+    def _resample(self, m: int, n: int) -> np.ndarray:
+        """Indices of ``n`` evenly spaced beams out of ``m`` (cached per ``m``)."""
+        idx = self._resample_idx.get(m)
+        if idx is None:
+            idx = self._resample_idx[m] = (np.arange(n) * m) // n
+        return idx
+
+
+def _fit(values, seg: np.ndarray) -> None:
+    """Copy as many ``values`` as fit into ``seg`` and zero the rest."""
+    k = min(len(values), len(seg))
+    seg[:k] = values[:k]
+    seg[k:] = 0.0
@@ -1,6 +1,7 @@
 import threading
 import time
 import math
+import numpy as np
 import pygame
 from typing import Callable, Optional
 from ..data import SensorData
@@ -83,7 +84,7 @@ class Drawer:
         cx, cy = self.world_to_screen(x, y)
 
         # Data Source is raw lidar.
-        if scan.ranges:
+        if len(scan.ranges):
             # Precompute angles
             n = len(scan.ranges)
             angles = [scan.angle_min + i * scan.angle_increment for i in range(n)]
@@ -115,12 +116,10 @@ class Drawer:
         if d.seen_hexes and d.seen_hexes.poses:
             markers = d.seen_hexes
             # print(markers)
-            for pose, id in zip(markers.poses, markers.marker_ids):
-                # Marker is in robot frame → transform to world
-                rel_x, rel_y = pose.x, pose.y
-                mx_world = d.odom.x + math.cos(theta) * rel_x - math.sin(theta) * rel_y
-                my_world = d.odom.y + math.sin(theta) * rel_x + math.cos(theta) * rel_y
-
+            # Markers are in robot frame → transform all of them to world
+            c, sn = math.cos(theta), math.sin(theta)
+            world = markers.xy @ np.array([[c, sn], [-sn, c]]) + (d.odom.x, d.odom.y)
+            for (mx_world, my_world), id in zip(world.tolist(), markers.marker_ids.tolist()):
                 mx = 400 + int(self.scale * mx_world)
                 my = 400 - int(self.scale * my_world)
 
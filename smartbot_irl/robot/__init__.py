@@ -6,7 +6,11 @@ from .smartbot import SmartBot
 # from .smartbot_base import SmartBotBase
 from .smartbot_real import SmartBotReal
 from .smartbot_sim import SmartBotSim
+from .smartbot_replay import SmartBotReplay
+from .smartbot_fleet import SmartBotFleet
+from .topic_config import TopicConfig
+from .async_smartbot import AsyncSmartBot
 
-SmartBotType: TypeAlias = SmartBotReal | SmartBotSim
+SmartBotType: TypeAlias = SmartBotReal | SmartBotSim | SmartBotReplay
 
-__all__ = ['SmartBot', 'SmartBotType']
+__all__ = ['SmartBot', 'SmartBotType', 'TopicConfig', 'AsyncSmartBot', 'SmartBotFleet']
@@ -0,0 +1,203 @@
+# async_smartbot.py
+"""
+asyncio front end for :class:`SmartBotReal` and :class:`SmartBotSim`.
+
+Receivers notify the bot's :class:`~smartbot_irl.robot.data_notifier.DataNotifier`
+from their own thread (roslibpy's reactor for the real robot). The wrapper
+registers a listener there that wakes the event loop with
+``call_soon_threadsafe``, so coroutines wait for data without blocking the loop
+or polling, and several robots can share one loop.
+"""
+
+import asyncio
+import inspect
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from ..data import Command, SensorData
+from .smartbot_real import SmartBotReal
+from .smartbot_sim import SmartBotSim
+
+StepFn = Callable[[SensorData], Command | None | Awaitable[Command | None]]
+
+
+class AsyncSmartBot:
+    """
+    Drive a robot from an asyncio event loop.
+
+    Args:
+        bot (SmartBotReal | SmartBotSim): An initialized robot.
+
+    Example::
+        async def main():
+            bot = SmartBot('real')
+            bot.init(host='192.168.33.2', command_rate=20)
+            abot = AsyncSmartBot(bot)
+
+            async for scan in abot.stream('scan'):
+                ...
+
+            await abot.run(step, rate=20)   # step(data) -> Command, sync or async
+    """
+
+    def __init__(self, bot: SmartBotReal | SmartBotSim):
+        notifier = getattr(bot, '_notifier', None)
+        if notifier is None:
+            raise TypeError(f'{type(bot).__name__} does not support waiting for data')
+        self.bot = bot
+        self._notifier = notifier
+        self._seen = dict(notifier.counts)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._events: set[asyncio.Event] = set()
+        self._wake_scheduled = False
+        self._running = False
+
+    # --------------------------------------------------------------
+    async def read(self) -> SensorData:
+        """Latest sensor data (a :class:`SensorSnapshot` on the real robot)."""
+        self._seen = dict(self._notifier.counts)
+        return self.bot.read()
+
+    async def write(self, cmd: Command) -> None:
+        """Send ``cmd``. Publishing synchronously over the websocket happens off the loop."""
+        if isinstance(self.bot, SmartBotReal) and self.bot.command_sender is None:
+            await asyncio.to_thread(self.bot.write, cmd)
+        else:
+            self.bot.write(cmd)
+
+    async def wait_for(self, topics=None, timeout: float | None = None, dt: float = 0.05) -> SensorData | None:
+        """Async :meth:`SmartBotReal.wait_for`: every topic has data not yet seen by :meth:`read`.
+
+        On the simulator, ``spin(dt)`` is called when nothing is fresh.
+        """
+        return await self._wait(topics, timeout, dt, all)
+
+    async def wait_any(self, topics=None, timeout: float | None = None, dt: float = 0.05) -> SensorData | None:
+        """Like :meth:`wait_for`, but return once any one of ``topics`` has new data."""
+        return await self._wait(topics, timeout, dt, any)
+
+    async def stream(self, topic: str) -> AsyncIterator[Any]:
+        """
+        Yield the message of ``topic`` (e.g. a :class:`LaserScan`) each time a new one arrives.
+
+        Latest wins: if the consumer falls behind, messages in between are
+        skipped rather than queued.
+        """
+        (field,) = self._notifier.resolve(topic)
+        counts, cond = self._notifier.counts, self._notifier.cond
+        last = counts[field]
+        event = self._event()
+        try:
+            while True:
+                if counts[field] == last:
+                    if isinstance(self.bot, SmartBotSim) and not self._running:
+                        self.bot.spin()
+                        await asyncio.sleep(0)  # Let other tasks run between sim steps.
+                        continue
+                    await event.wait()
+                    event.clear()
+                    continue
+                with cond:
+                    last = counts[field]
+                    msg = getattr(self.bot.sensor_data, field)
+                yield msg
+        finally:
+            self._events.discard(event)
+
+    async def run(self, step: StepFn, rate: float, steps: int | None = None) -> int:
+        """
+        Call ``step(data)`` at a fixed ``rate`` (Hz) and write what it returns.
+
+        ``step`` may be a plain function or a coroutine function; returning
+        None sends nothing. Ticks are scheduled on absolute times so they do
+        not drift; a step that overruns its period starts the next one late
+        instead of bunching up. Each tick also calls ``bot.spin(period)``,
+        which advances the simulator (or draws, on the real robot).
+
+        Args:
+            step (Callable): Controller, ``step(data) -> Command | None``.
+            rate (float): Ticks per second.
+            steps (int, optional): Stop after this many ticks. Default: until
+                :meth:`stop` is called or the task is cancelled.
+
+        Returns:
+            int: Number of ticks run.
+        """
+        loop = asyncio.get_running_loop()
+        period = 1.0 / rate
+        deadline = loop.time()
+        n = 0
+        self._running = True
+        try:
+            while self._running and (steps is None or n < steps):
+                cmd = step(await self.read())
+                if inspect.isawaitable(cmd):
+                    cmd = await cmd
+                if cmd is not None:
+                    await self.write(cmd)
+                self.bot.spin(period)
+                n += 1
+                deadline += period
+                delay = deadline - loop.time()
+                if delay < 0:
+                    deadline = loop.time()  # Overran: do not try to catch up.
+                await asyncio.sleep(max(0.0, delay))
+        finally:
+            self._running = False
+        return n
+
+    def stop(self) -> None:
+        """Make :meth:`run` return after the current tick."""
+        self._running = False
+
+    def close(self) -> None:
+        """Detach from the bot's notifications (the bot itself keeps running)."""
+        self._notifier.remove_listener(self._on_notify)
+        self._loop = None
+
+    # --------------------------------------------------------------
+    def _event(self) -> asyncio.Event:
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+            self._notifier.add_listener(self._on_notify)
+        elif loop is not self._loop:
+            raise RuntimeError('AsyncSmartBot is bound to a different event loop')
+        event = asyncio.Event()
+        self._events.add(event)
+        return event
+
+    def _on_notify(self, fields) -> None:
+        # Receiving thread: coalesce bursts into one wake-up of the loop.
+        if self._wake_scheduled or self._loop is None:
+            return
+        self._wake_scheduled = True
+        try:
+            self._loop.call_soon_threadsafe(self._wake)
+        except RuntimeError:  # Loop closed.
+            self._wake_scheduled = False
+
+    def _wake(self) -> None:
+        self._wake_scheduled = False
+        for event in self._events:
+            event.set()
+
+    async def _wait(self, topics, timeout, dt, test) -> SensorData | None:
+        fields = self._notifier.resolve(topics)
+        counts = self._notifier.counts
+
+        def ready() -> bool:
+            return test(counts[f] > self._seen[f] for f in fields)
+
+        if isinstance(self.bot, SmartBotSim) and not ready():
+            self.bot.spin(dt)
+        event = self._event()
+        try:
+            async with asyncio.timeout(timeout):
+                while not ready():
+                    await event.wait()
+                    event.clear()
+        except TimeoutError:
+            return None
+        finally:
+            self._events.discard(event)
+        return await self.read()
@@ -0,0 +1,165 @@
+# command_sender.py
+"""
+Latest-wins background publishing of :class:`~smartbot_irl.data.Command`.
+
+:meth:`CommandSender.submit` only stores the newest command, so a control
+loop never waits on the websocket. A sender thread publishes at most
+``rate`` times a second and only the sub-messages (Twist, preset string,
+gripper bool) that differ from what it last sent. The last Twist is repeated
+every ``1 / keepalive_rate`` seconds so the robot's command timeout does not
+stop it while the commanded velocity stays the same. Once nothing has been
+submitted for ``stale_after`` seconds (the control loop hung or died), the
+keep-alives stop and a zero Twist is sent, so the robot still comes to a halt.
+"""
+
+import threading
+from copy import copy
+from time import monotonic
+from typing import Callable
+
+from ..data import Command
+
+TWIST = 'geometry_msgs/Twist'
+ZERO_TWIST = {'linear': {'x': 0.0, 'y': 0.0, 'z': 0.0}, 'angular': {'x': 0.0, 'y': 0.0, 'z': 0.0}}
+
+
+class CommandSender:
+    """
+    Publish the latest submitted command from a background thread.
+
+    Args:
+        publishers (dict[str, Callable[[dict], None]]): Publish function per
+            message type of :meth:`Command.to_ros` (``'geometry_msgs/Twist'``,
+            ``'std_msgs/String'``, ``'std_msgs/Bool'``).
+        rate (float): Maximum publishing cycles per second.
+        keepalive_rate (float): How often the last Twist is re-sent while
+            nothing changes, per second. 0 disables keep-alives.
+        stale_after (float, optional): Stop keep-alives and send a zero Twist
+            once no command was submitted for this many seconds. Default:
+            three keep-alive periods.
+        start (bool): Start the sender thread. With False, whoever owns the
+            sender calls :meth:`poll` instead (e.g. one thread for a fleet).
+        wake (threading.Event, optional): Set on every :meth:`submit`; pass a
+            shared one to drive several senders from one thread.
+
+    Example::
+        sender = CommandSender({'geometry_msgs/Twist': publish_twist}, rate=20)
+        sender.submit(Command(linear_vel=0.2))  # Returns immediately.
+        sender.close()
+    """
+
+    def __init__(
+        self,
+        publishers: dict[str, Callable[[dict], None]],
+        rate: float = 20.0,
+        keepalive_rate: float = 2.0,
+        stale_after: float | None = None,
+        start: bool = True,
+        wake: threading.Event | None = None,
+    ):
+        if rate <= 0 or keepalive_rate < 0 or (stale_after is not None and stale_after <= 0):
+            raise ValueError('rate and stale_after must be > 0 and keepalive_rate >= 0')
+        self.publishers = publishers
+        self.period = 1.0 / rate
+        self.keepalive_period = 1.0 / keepalive_rate if keepalive_rate else None
+        if stale_after is None and self.keepalive_period is not None:
+            stale_after = 3 * self.keepalive_period
+        self.stale_after = stale_after
+        self.published = 0  # Sub-messages sent, keep-alives included.
+        self.suppressed = 0  # Sub-messages skipped because they had not changed.
+
+        self._lock = threading.Lock()
+        self._latest: Command | None = None
+        self._last_sent: dict[str, dict] = {}
+        self._last_twist_time = 0.0
+        self._last_submit = monotonic()
+        self._stale = False  # Keep-alives stopped until the next submit().
+        self._wake = wake if wake is not None else threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        if start:
+            self._thread = threading.Thread(target=self._run, name='command-sender', daemon=True)
+            self._thread.start()
+
+    def submit(self, cmd: Command) -> None:
+        """Make ``cmd`` the next command to send, replacing any not yet sent."""
+        cmd = copy(cmd)  # The caller may keep mutating theirs.
+        with self._lock:
+            self._latest = cmd
+            self._last_submit = monotonic()
+            self._stale = False
+        self._wake.set()
+
+    def poll(self) -> float | None:
+        """Send the pending command and a due keep-alive, if any.
+
+        Returns:
+            Seconds until the next keep-alive is due, or None if none is.
+        """
+        self._send_pending()
+        self._send_keepalive()
+        return self._until_keepalive()
+
+    def close(self, timeout: float = 1.0) -> None:
+        """Send the pending command, if any, and stop the thread."""
+        if self._thread is None:
+            self._send_pending()
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+
+    # --------------------------------------------------------------
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self._until_keepalive())
+            self._wake.clear()
+            started = monotonic()
+            self._send_pending()
+            self._send_keepalive()
+            # Rate limit: newer commands wait for the next cycle (latest wins).
+            self._stop.wait(self.period - (monotonic() - started))
+        self._send_pending()
+
+    def _until_keepalive(self) -> float | None:
+        if self.keepalive_period is None or TWIST not in self._last_sent or self._stale:
+            return None
+        due = min(self._last_twist_time + self.keepalive_period, self._last_submit + self.stale_after)
+        return max(0.0, due - monotonic())
+
+    def _send_pending(self) -> None:
+        with self._lock:
+            cmd, self._latest = self._latest, None
+        if cmd is None:
+            return
+        for ros_type, msg in cmd.to_ros().items():
+            if self._last_sent.get(ros_type) == msg:
+                self.suppressed += 1
+                continue
+            self._publish(ros_type, msg)
+
+    def _send_keepalive(self) -> None:
+        if self._until_keepalive() != 0.0:
+            return
+        with self._lock:
+            self._stale = monotonic() - self._last_submit >= self.stale_after
+        if not self._stale:
+            self._publish(TWIST, self._last_sent[TWIST])
+            return
+        # No command for stale_after: let the robot stop instead of driving on blind.
+        if self._last_sent[TWIST] != ZERO_TWIST:
+            self._publish(TWIST, ZERO_TWIST)
+
+    def _publish(self, ros_type: str, msg: dict) -> None:
+        publish = self.publishers.get(ros_type)
+        if publish is None:
+            return
+        try:
+            publish(msg)
+        except Exception as e:
+            print(f'Warning: failed to publish {ros_type}: {e}')
+            return
+        self._last_sent[ros_type] = msg
+        self.published += 1
+        if ros_type == TWIST:
+            self._last_twist_time = monotonic()
@@ -0,0 +1,80 @@
+# data_notifier.py
+"""
+Wake control loops when new sensor data arrives instead of polling.
+
+Receivers count messages per SensorData field under one condition variable
+and notify it on every message. :meth:`DataNotifier.wait` blocks until the
+requested fields have new messages since the last ``read()``.
+"""
+
+import threading
+from typing import Callable, Iterable
+
+
+class DataNotifier:
+    """
+    Per-field message counters with a condition variable to wait on them.
+
+    Call :meth:`notify` and :meth:`mark_seen` with :attr:`cond` held.
+    Listeners added with :meth:`add_listener` are called from :meth:`notify`
+    on the receiving thread, so they must be quick (e.g. hand off to an
+    event loop).
+
+    Args:
+        fields (Iterable[str]): SensorData field names that receive messages.
+        aliases (dict[str, str], optional): Other accepted names per field,
+            e.g. ROS topic names (``{'livox/imu': 'imu'}``).
+    """
+
+    def __init__(self, fields: Iterable[str], aliases: dict[str, str] | None = None):
+        self.cond = threading.Condition()
+        self.counts: dict[str, int] = dict.fromkeys(fields, 0)
+        self._seen = dict(self.counts)
+        self._aliases = {**(aliases or {}), **{f: f for f in self.counts}}
+        self._listeners: list[Callable[[tuple[str, ...]], None]] = []
+
+    def notify(self, *fields: str) -> None:
+        """Count one new message for each of ``fields`` and wake all waiters."""
+        for field in fields:
+            self.counts[field] += 1
+        self.cond.notify_all()
+        for listener in self._listeners:
+            listener(fields)
+
+    def add_listener(self, listener: Callable[[tuple[str, ...]], None]) -> None:
+        """Call ``listener(fields)`` on every :meth:`notify`."""
+        with self.cond:
+            self._listeners = [*self._listeners, listener]
+
+    def remove_listener(self, listener: Callable[[tuple[str, ...]], None]) -> None:
+        with self.cond:
+            self._listeners = [f for f in self._listeners if f is not listener]
+
+    def mark_seen(self) -> None:
+        """Everything received so far has been read."""
+        self._seen = self.counts.copy()
+
+    def resolve(self, topics: Iterable[str] | str | None) -> list[str]:
+        """Field names for ``topics`` (field or topic names; None means all fields)."""
+        if topics is None:
+            return list(self.counts)
+        if isinstance(topics, str):
+            topics = [topics]
+        try:
+            return [self._aliases[t.lstrip('/')] for t in topics]
+        except KeyError as e:
+            raise KeyError(f'Unknown topic {e.args[0]!r}; use one of {sorted(self._aliases)}') from None
+
+    def fresh(self, fields: list[str]) -> list[str]:
+        """Which of ``fields`` have messages that were not read yet."""
+        return [f for f in fields if self.counts[f] > self._seen[f]]
+
+    def ready(self, fields: list[str], require_all: bool = True) -> bool:
+        """Whether all (or any) of ``fields`` are fresh."""
+        test = all if require_all else any
+        return test(self.counts[f] > self._seen[f] for f in fields)
+
+    def wait(self, fields: list[str], timeout: float | None = None, require_all: bool = True) -> bool:
+        """Block until all (or any) of ``fields`` are fresh. False on timeout."""
+        with self.cond:
+            return self.cond.wait_for(lambda: self.ready(fields, require_all), timeout)
@@ -4,6 +4,7 @@ from typing import overload, Literal, Union
 
 from .smartbot_sim import SmartBotSim
 from .smartbot_real import SmartBotReal
+from .smartbot_replay import SmartBotReplay
 from .smartbot_base import SmartBotBase
 
 
@@ -11,11 +12,15 @@ from .smartbot_base import SmartBotBase
 def SmartBot(mode: Literal["real"], drawing: bool = False, **kwargs) -> SmartBotReal: ...
 @overload
 def SmartBot(mode: Literal["sim"], drawing: bool = False, **kwargs) -> SmartBotSim: ...
+@overload
+def SmartBot(mode: Literal["replay"], drawing: bool = False, **kwargs) -> SmartBotReplay: ...
 def SmartBot(
     mode: str = "real", drawing: bool = False, **kwargs
-) -> Union[SmartBotReal, SmartBotSim]:
-    """Factory that returns a SmartBotReal or SmartBotSim instance."""
+) -> Union[SmartBotReal, SmartBotSim, SmartBotReplay]:
+    """Factory that returns a SmartBotReal, SmartBotSim or SmartBotReplay instance."""
     if mode == "sim":
         return SmartBotSim(drawing=drawing, **kwargs)
+    elif mode == "replay":
+        return SmartBotReplay(drawing=drawing, **kwargs)
     else:
         return SmartBotReal(drawing=drawing, **kwargs)
@@ -0,0 +1,288 @@
+# smartbot_fleet.py
+"""
+Many robots over few rosbridge connections.
+
+Every :class:`SmartBotReal` normally opens its own ``roslibpy.Ros`` client,
+and with it its own websocket, its own subscription callbacks routed through
+roslibpy's event emitter and one reactor wake-up per published message.
+:class:`SmartBotFleet` instead opens one connection (or a small pool) per
+rosbridge host and attaches a :class:`SmartBotReal` per robot to it:
+
+* incoming messages go straight from the rosbridge ``publish`` op to the
+  callback of the robot whose ``/smartbot{N}`` prefix the topic starts with,
+  through one route table per connection;
+* commands of all robots are collected by one sender thread and written to
+  each connection in a single reactor call per cycle.
+
+The robots keep their whole API (``read``, ``wait_for``, ``stats``,
+:class:`AsyncSmartBot`, ...); only ``write`` always goes through the shared
+background sender.
+"""
+
+import json
+import threading
+from time import monotonic
+from typing import Callable, Iterable, Iterator
+
+import roslibpy
+from roslibpy.core import MessageEncoder
+
+from ..data import Command, SensorSnapshot
+from ..utils import SmartLogger
+from .command_sender import CommandSender
+from .smartbot_real import SmartBotReal
+from .transport import BinaryTransport, _roslibpy_attr
+import logging
+
+logger = SmartLogger(level=logging.INFO)  # Print statements, but better!
+
+
+class _Connection(BinaryTransport):
+    """One rosbridge connection shared by several robots."""
+
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.client = roslibpy.Ros(host=host, port=port, is_secure=False)
+        self.routes: dict[str, Callable[[dict], None]] = {}  # Topic name -> subscription callback.
+        self._outbox: list[tuple[str, dict]] = []  # (topic, msg) to publish on the next flush().
+        super().__init__(self.client)
+
+    def connect(self, timeout: float = 5.0) -> None:
+        ready = threading.Event()
+        self.client.on_ready(ready.set)
+        self.client.run()
+        logger.info(f'Connecting to rosbridge at ws://{self.host}:{self.port} ...')
+        ready.wait(timeout=timeout)
+        if not self.client.is_connected:
+            logger.error(msg=f'Could not connect to rosbridge at {self.host}:{self.port}!')
+            raise RuntimeError('Failed to connect to rosbridge_server.')
+
+    def subscribe(self, topic: roslibpy.Topic, callback, compression: str = 'none') -> None:
+        self.routes[topic.name] = callback
+        super().subscribe(topic, callback, compression)
+
+    def unsubscribe(self, topic: roslibpy.Topic) -> None:
+        self.routes.pop(topic.name, None)
+        super().unsubscribe(topic)
+
+    def publish(self, topic: str, msg: dict) -> None:
+        """Queue ``msg`` for the next :meth:`flush` (sender thread only)."""
+        self._outbox.append((topic, msg))
+
+    def flush(self) -> None:
+        """Send everything queued by :meth:`publish` in one reactor call."""
+        if not self._outbox:
+            return
+        batch, self._outbox = self._outbox, []
+        proto = _roslibpy_attr(self.client.factory, '_proto')
+        if proto is None:
+            logger.warning(f'Dropped {len(batch)} commands; not connected to {self.host}:{self.port}')
+            return
+        payloads = [
+            json.dumps({'op': 'publish', 'topic': topic, 'msg': msg}, cls=MessageEncoder).encode('utf8')
+            for topic, msg in batch
+        ]
+        self.client.call_later(0, lambda: self._write(proto, payloads))
+
+    def close(self) -> None:
+        try:
+            if self.client.is_connected:
+                self.client.terminate()
+            self.client.close()
+        except Exception as e:
+            logger.error(f'Error closing rosbridge client {self.host}:{self.port}: {e}')
+
+    # --------------------------------------------------------------
+    @staticmethod
+    def _write(proto, payloads: list[bytes]) -> None:
+        # Reactor thread: the frames go out together on the next write to the socket.
+        for payload in payloads:
+            proto.sendMessage(payload, isBinary=False)
+
+    def _patch(self, proto) -> None:
+        super()._patch(proto)
+        if getattr(proto, '_smartbot_routes', False):
+            return
+        proto._smartbot_routes = True
+        handlers = _roslibpy_attr(proto, '_message_handlers')
+        on_publish = handlers['publish']
+
+        def route(message):
+            callback = self.routes.get(message['topic'])
+            if callback is None:
+                return on_publish(message)  # Not ours: roslibpy's event emitter.
+            callback(message['msg'])
+
+        handlers['publish'] = route
+
+
+class SmartBotFleet:
+    """
+    Control many real robots from one process over shared rosbridge connections.
+
+    Args:
+        smartbot_nums (Iterable[int]): Robot numbers; robot N uses the
+            ``/smartbot{N}/...`` topics.
+
+    Example::
+        fleet = SmartBotFleet(range(20))
+        fleet.init(host='192.168.33.2', command_rate=20)
+        try:
+            while True:
+                data = fleet.read()  # {num: SensorSnapshot}
+                fleet.write({n: step(d) for n, d in data.items()})
+                time.sleep(0.05)
+        finally:
+            fleet.shutdown()
+
+        fleet[3].wait_for('scan')  # Each robot is a SmartBotReal.
+    """
+
+    def __init__(self, smartbot_nums: Iterable[int]):
+        self.robots: dict[int, SmartBotReal] = {n: SmartBotReal(smartbot_num=n) for n in smartbot_nums}
+        self.connections: list[_Connection] = []
+        self.period = 0.05
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._connection_of: dict[int, _Connection] = {}  # Robot number -> its connection.
+
+    def init(
+        self,
+        host: str | dict[int, str] = 'localhost',
+        port: int = 9090,
+        connections: int = 1,
+        yaml_path=None,
+        topics: dict | None = None,
+        lazy: bool = False,
+        command_rate: float = 20.0,
+        keepalive_rate: float = 2.0,
+    ) -> None:
+        """Connect and subscribe every robot.
+
+        Args:
+            host (str | dict[int, str], optional): rosbridge host of all
+                robots, or a host per robot number.
+            port (int, optional): rosbridge port.
+            connections (int, optional): Connections per host; robots are
+                spread over them round-robin.
+            yaml_path, topics, lazy: Per-robot settings, as in
+                :meth:`SmartBotReal.init`.
+            command_rate (float, optional): Send cycles per second of the
+                shared command sender.
+            keepalive_rate (float, optional): Re-send rate of unchanged
+                velocity commands, per robot. 0 disables this. A robot that
+                gets no command for three periods is sent a zero velocity.
+        """
+        if connections < 1:
+            raise ValueError('connections must be >= 1')
+        if command_rate <= 0:
+            raise ValueError('command_rate must be > 0')
+        hosts = host if isinstance(host, dict) else dict.fromkeys(self.robots, host)
+        missing = set(self.robots) - set(hosts)
+        if missing:
+            raise KeyError(f'No host given for smartbots {sorted(missing)}')
+
+        # One pool of connections per host; robot i of that host uses connection i % size.
+        by_host: dict[str, list[int]] = {}
+        for num in self.robots:
+            by_host.setdefault(hosts[num], []).append(num)
+        for h, nums in by_host.items():
+            pool = [_Connection(h, port) for _ in range(min(connections, len(nums)))]
+            for conn in pool:
+                conn.connect()
+            self.connections.extend(pool)
+            for i, num in enumerate(nums):
+                self._connection_of[num] = pool[i % len(pool)]
+
+        for num, bot in self.robots.items():
+            conn = self._connection_of[num]
+            bot._configure_topics(yaml_path, topics)
+            bot._attach(conn.client, conn, lazy=lazy, owns_client=False)
+            for pub in (bot.cmd_vel_pub, bot.manipulator_presets_pub, bot.gripper_closed_pub):
+                pub.advertise()
+            bot.command_sender = CommandSender(
+                self._publishers(bot, conn),
+                rate=command_rate,
+                keepalive_rate=keepalive_rate,
+                start=False,
+                wake=self._wake,
+            )
+
+        self.period = 1.0 / command_rate
+        self._thread = threading.Thread(target=self._run, name='fleet-command-sender', daemon=True)
+        self._thread.start()
+        logger.info(f'{len(self.robots)} smartbots on {len(self.connections)} rosbridge connection(s)')
+
+    # --------------------------------------------------------------
+    def __getitem__(self, num: int) -> SmartBotReal:
+        return self.robots[num]
+
+    def __iter__(self) -> Iterator[SmartBotReal]:
+        return iter(self.robots.values())
+
+    def __len__(self) -> int:
+        return len(self.robots)
+
+    def read(self) -> dict[int, SensorSnapshot]:
+        """:meth:`SmartBotReal.read` of every robot, by robot number."""
+        return {num: bot.read() for num, bot in self.robots.items()}
+
+    def write(self, cmds: dict[int, Command | None]) -> None:
+        """Queue a command per robot number; all go out together on the next send cycle.
+
+        None entries are skipped.
+        """
+        for num, cmd in cmds.items():
+            if cmd is not None:
+                self.robots[num].write(cmd)
+
+    def stats(self) -> dict[int, dict[str, dict]]:
+        """:meth:`SmartBotReal.stats` of every robot, by robot number."""
+        return {num: bot.stats() for num, bot in self.robots.items()}
+
+    def shutdown(self) -> None:
+        """Send the last commands, unsubscribe every robot and close the connections."""
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join(1.0)
+            self._thread = None
+        for bot in self.robots.values():
+            bot.command_sender = None  # Already flushed by the sender thread.
+            bot.shutdown()
+        for conn in self.connections:
+            conn.close()
+        self.connections.clear()
+
+    # --------------------------------------------------------------
+    @staticmethod
+    def _publishers(bot: SmartBotReal, conn: _Connection) -> dict[str, Callable[[dict], None]]:
+        prefix = bot._prefix
+        return {
+            'geometry_msgs/Twist': lambda msg: conn.publish(prefix + '/cmd_vel', msg),
+            'std_msgs/String': lambda msg: conn.publish(prefix + '/manipulator_presets', msg),
+            'std_msgs/Bool': lambda msg: conn.publish(prefix + '/gripper_closed', msg),
+        }
+
+    def _run(self) -> None:
+        timeout = None
+        while not self._stop.is_set():
+            self._wake.wait(timeout)
+            self._wake.clear()
+            started = monotonic()
+            timeout = self._send_all()
+            # Rate limit: newer commands wait for the next cycle (latest wins).
+            self._stop.wait(self.period - (monotonic() - started))
+            if timeout is not None:
+                timeout = max(0.0, timeout - (monotonic() - started))
+        self._send_all()
+
+    def _send_all(self) -> float | None:
+        """One send pass over all robots. Returns seconds until a keep-alive is due."""
+        due = [
+            t for bot in self.robots.values() if (t := bot.command_sender.poll()) is not None
+        ]
+        for conn in self.connections:
+            conn.flush()
+        return min(due, default=None)
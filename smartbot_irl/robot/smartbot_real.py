@@ -7,7 +7,10 @@ from typing import Optional
 import yaml
 
 from .smartbot_base import SmartBotBase
-from ..data._converters import ROS_TYPE_MAP
+from .command_sender import CommandSender
+from .data_notifier import DataNotifier
+from .topic_config import TopicConfig, load_topic_config
+from .transport import BinaryTransport
 from ..data._type_maps import (
     ArucoMarkers,
     Odometry,
@@ -25,13 +28,26 @@ from dataclasses import dataclass, field
 
 import roslibpy
 
-from ..data import Command, Pose, SensorData
+from ..data import Command, LazySensorData, Pose, SensorData, SensorRecorder, SensorSnapshot, TopicStats
 from ..drawing import Drawer
 from smartbot_irl.utils import SmartLogger
 import logging
 
 logger = SmartLogger(level=logging.INFO)  # Print statements, but better!
 
+# Which topics and their types we subscribe to.
+TOPIC_MAP = {  # "<ros2_topic_name>": (<type_maps.Pose>, "<SensorData.field>")
+    'odom': (Odometry, 'odom'),
+    'scan': (LaserScan, 'scan'),
+    'joint_states': (JointState, 'joints'),
+    'aruco_poses': (PoseArray, 'aruco_poses'),
+    'livox/imu': (IMU, 'imu'),
+    'gripper_curr_state': (String, 'gripper_curr_state'),
+    'manipulator_curr_preset': (String, 'manipulator_curr_preset'),
+    'seen_robots': (PoseArray, 'seen_robots'),
+    'seen_hexes': (ArucoMarkers, 'seen_hexes'),
+}
+
 
 class SmartBotReal(SmartBotBase):
     """
@@ -42,29 +58,41 @@ class SmartBotReal(SmartBotBase):
     def __init__(self, drawing=False, smartbot_num=0, draw_region=((-5, 5), (-5, 5))):
         super().__init__(drawing=drawing, draw_region=draw_region)
 
-        self.drawer = Drawer(lambda: self.sensor_data, region=draw_region) if drawing else None
+        self.drawer = Drawer(self._snapshot, region=draw_region) if drawing else None
         self._running = False
         self.smartbot_num = smartbot_num
         print(f'my num is {self.smartbot_num}')
         self.client: roslibpy.Ros | None = None
+        self._transport: BinaryTransport | None = None
+        self._owns_client = True  # False when the connection is shared (see SmartBotFleet).
         self._connected = threading.Event()
 
         # Specify which topics and their types we will subscribe to.
+        # Callbacks write into sensor_data; read() hands out snapshots of it.
         self.sensor_data = SensorData()
-        self._topic_map = {  # "<ros2_topic_name>": (<type_maps.Pose>, "<SensorData.field>")
-            'odom': (Odometry, 'odom'),
-            'scan': (LaserScan, 'scan'),
-            'joint_states': (JointState, 'joints'),
-            'aruco_poses': (PoseArray, 'aruco_poses'),
-            'livox/imu': (IMU, 'imu'),
-            'gripper_curr_state': (String, 'gripper_curr_state'),
-            'manipulator_curr_preset': (String, 'manipulator_curr_preset'),
-            'seen_robots': (PoseArray, 'seen_robots'),
-            'seen_hexes': (ArucoMarkers, 'seen_hexes'),
-        }
+        self._topic_map = dict(TOPIC_MAP)
+        self._notifier = DataNotifier(
+            (f for _, f in self._topic_map.values()),
+            aliases={name: f for name, (_, f) in self._topic_map.items()},
+        )
+        self._data_lock = self._notifier.cond  # Guards sensor_data; notified on every message.
+        self._seq = 0  # Messages applied to sensor_data so far.
+        self._last_snapshot: SensorSnapshot | None = None
 
         # Keep a list of our connected topics.
         self._subscriptions: list[roslibpy.Topic] = []
+        self._topics: dict[str, roslibpy.Topic] = {}  # Subscribed topics by name.
+        self._prefix = f'/smartbot{self.smartbot_num}'
+
+        # Per-topic throttle/queue/decimation settings (see init(topics=...)).
+        self.topic_config: dict[str, TopicConfig] = {name: TopicConfig() for name in self._topic_map}
+        self._decimation_counts: dict[str, int] = dict.fromkeys(self._topic_map, 0)
+
+        # Arrival counters, age, rate and jitter per SensorData field.
+        self.topic_stats: dict[str, TopicStats] = {field: TopicStats() for _, field in self._topic_map.values()}
+
+        # Optional raw message recorder (see init(record_path=...)).
+        self.recorder: SensorRecorder | None = None
 
         # Publishers.
         self.cmd_vel_pub: Optional[roslibpy.Topic] = None
@@ -72,7 +100,20 @@ class SmartBotReal(SmartBotBase):
         self.gripper_closed_pub: Optional[roslibpy.Topic] = None
         self.place_hex_pub: Optional[roslibpy.Topic] = None
 
-    def init(self, host: str = 'localhost', port: int = 9090, yaml_path=None) -> None:
+        # Background command publishing (see init(command_rate=...)).
+        self.command_sender: CommandSender | None = None
+
+    def init(
+        self,
+        host: str = 'localhost',
+        port: int = 9090,
+        yaml_path=None,
+        record_path=None,
+        lazy: bool = False,
+        topics: dict | None = None,
+        command_rate: float | None = None,
+        keepalive_rate: float = 2.0,
+    ) -> None:
         """Connect the smartbot wrapper to a real smartbot.
 
         Args:
@@ -85,13 +126,53 @@ class SmartBotReal(SmartBotBase):
             port (int, optional):
                 What port to try and connect to the rosbridge on. The
                 rosbridge_server node defaults to 9090.
+
+            yaml_path (str, optional):
+                YAML file whose ``topics`` section holds per-topic settings
+                (see :mod:`smartbot_irl.robot.topic_config`).
+
+            topics (dict, optional):
+                Per-topic settings, applied on top of ``yaml_path``. Maps a
+                topic name (e.g. ``'scan'``) to a dict of
+                :class:`~smartbot_irl.robot.topic_config.TopicConfig` fields,
+                e.g. ``{'scan': {'throttle_rate': 100, 'compression': 'cbor'},
+                'seen_robots': {'enabled': False}}``. Change them later with
+                :meth:`configure_topic`.
+
+            record_path (str, optional):
+                If given, every message received on every topic is appended to
+                this binary log with its receive time (see
+                :class:`smartbot_irl.data.SensorRecorder`). Read it back with
+                :class:`smartbot_irl.data.SensorLog`.
+
+            lazy (bool, optional):
+                If True, callbacks only keep the latest raw message per topic
+                and :meth:`read` returns a
+                :class:`smartbot_irl.data.LazySensorData` that decodes each
+                field when it is first accessed after new data arrives. Topics
+                published faster than your loop reads them then cost almost
+                nothing to receive.
+
+            command_rate (float, optional):
+                If given, :meth:`write` only stores the latest command and a
+                background thread publishes at most ``command_rate`` times a
+                second, sending only the parts of the command that changed
+                (see :class:`smartbot_irl.robot.command_sender.CommandSender`).
+                By default :meth:`write` publishes synchronously.
+
+            keepalive_rate (float, optional):
+                With ``command_rate``, how often per second the last velocity
+                command is re-sent while it does not change. 0 disables this.
+                Keep-alives stop, and a zero velocity is sent, once
+                :meth:`write` has not been called for three of these periods.
         """
-        prefix = f'/smartbot{self.smartbot_num}'
         self._running = True
+        self._configure_topics(yaml_path, topics)
 
         # Connect to ros bridge server. Give up after 5s.
         logger.info(msg='Connecting to smartbot...')
         self.client = roslibpy.Ros(host=host, port=port, is_secure=False)
+        self._transport = BinaryTransport(self.client)
         self.client.on_ready(self._connected.set)
         self.client.run()
         logger.info(f'Connecting to rosbridge at ws://{host}:{port} ...')
@@ -101,6 +182,38 @@ class SmartBotReal(SmartBotBase):
             logger.error(msg='Could not connect to smartbot!')
             raise RuntimeError('Failed to connect to rosbridge_server.')
 
+        self._attach(self.client, self._transport, lazy=lazy, record_path=record_path)
+        if command_rate is not None:
+            self.command_sender = CommandSender(
+                self._command_publishers(), rate=command_rate, keepalive_rate=keepalive_rate
+            )
+
+    def _configure_topics(self, yaml_path=None, topics: dict | None = None) -> None:
+        """Apply the ``yaml_path`` and ``topics`` settings of :meth:`init` to :attr:`topic_config`."""
+        settings = load_topic_config(yaml_path) if yaml_path is not None else {}
+        for name, changes in (topics or {}).items():
+            settings[name] = {**settings.get(name, {}), **changes}
+        for name, changes in settings.items():
+            if name not in self.topic_config:
+                logger.warning(f'Ignoring settings for unknown topic {name!r}')
+                continue
+            self.topic_config[name] = self.topic_config[name].updated(changes)
+
+    def _attach(
+        self,
+        client: roslibpy.Ros,
+        transport: BinaryTransport,
+        lazy: bool = False,
+        record_path=None,
+        owns_client: bool = True,
+    ) -> None:
+        """Set up publishers and subscribers on a connected ``client``."""
+        prefix = self._prefix
+        self.client = client
+        self._transport = transport
+        self._owns_client = owns_client
+        self._running = True
+
         # Set up publishers.
         self.cmd_vel_pub = roslibpy.Topic(
             self.client,
@@ -123,14 +236,99 @@ class SmartBotReal(SmartBotBase):
             'geometry_msgs/Pose',
         )
 
+        if lazy:
+            self.sensor_data = LazySensorData()
+
+        if record_path is not None:
+            self.recorder = SensorRecorder(record_path)
+            logger.info(f'Recording sensor messages to {record_path}')
+
         # Set up subscribers.
-        for name, (cls, field_name) in self._topic_map.items():
-            topic = roslibpy.Topic(self.client, f'{prefix}/{name}', cls.ros_type)
-            topic.subscribe(
-                lambda msg, f=field_name, c=cls: setattr(self.sensor_data, f, c.from_ros(msg))
-            )
+        for name in self._topic_map:
+            if self.topic_config[name].enabled:
+                self._subscribe(name)
         print(f'Subscribers and publishers found for {prefix}/* topics')
 
+    def configure_topic(self, name: str, **settings) -> TopicConfig:
+        """Change the settings of one topic while connected.
+
+        ``decimate`` takes effect immediately. Changing ``enabled``,
+        ``throttle_rate``, ``queue_length`` or ``compression`` re-subscribes
+        the topic over the existing rosbridge connection.
+
+        Example::
+            bot.configure_topic('scan', throttle_rate=500)  # Slow scans down.
+            bot.configure_topic('seen_robots', enabled=False)
+        """
+        if name not in self.topic_config:
+            raise KeyError(f'Unknown topic {name!r}')
+        old = self.topic_config[name]
+        new = self.topic_config[name] = old.updated(settings)
+        self._decimation_counts[name] = 0
+
+        resubscribe = (new.throttle_rate, new.queue_length, new.compression) != (
+            old.throttle_rate,
+            old.queue_length,
+            old.compression,
+        )
+        if self.client is not None and self.client.is_connected:
+            if name in self._topics and (resubscribe or not new.enabled):
+                self._unsubscribe(name)
+            if new.enabled and name not in self._topics:
+                self._subscribe(name)
+        return new
+
+    def _subscribe(self, name: str) -> None:
+        cls, field_name = self._topic_map[name]
+        cfg = self.topic_config[name]
+        topic = roslibpy.Topic(
+            self.client,
+            f'{self._prefix}/{name}',
+            cls.ros_type,
+            throttle_rate=int(cfg.throttle_rate),
+            queue_length=int(cfg.queue_length),
+        )
+        self._transport.subscribe(
+            topic,
+            lambda msg, n=name, f=field_name, c=cls: self._on_message(n, c, f, msg),
+            compression=cfg.compression,
+        )
+        self._topics[name] = topic
+        self._subscriptions.append(topic)
+
+    def _unsubscribe(self, name: str) -> None:
+        topic = self._topics.pop(name)
+        self._subscriptions.remove(topic)
+        try:
+            self._transport.unsubscribe(topic)
+        except Exception as e:
+            print(f'Warning: failed to unsubscribe {topic.name}: {e}')
+
+    def _on_message(self, name: str, cls, field_name: str, msg: dict) -> None:
+        """Subscription callback (runs on the roslibpy thread)."""
+        stamp = self.topic_stats[field_name].record(msg)
+        if self.recorder is not None:
+            self.recorder.record(name, msg, cls.ros_type)  # Every message, like the stats.
+        decimate = self.topic_config[name].decimate
+        if decimate > 1:
+            count = self._decimation_counts[name] = self._decimation_counts[name] + 1
+            if count % decimate:
+                return
+        data = self.sensor_data
+        if isinstance(data, LazySensorData):
+            with self._data_lock:
+                data.set_raw(field_name, cls, msg, stamp.receive_time)
+                data.stamps[field_name] = stamp
+                self._seq += 1
+                self._notifier.notify(field_name)
+        else:
+            value = cls.from_ros(msg)  # Decode outside the lock.
+            with self._data_lock:
+                setattr(data, field_name, value)
+                data.stamps[field_name] = stamp
+                self._seq += 1
+                self._notifier.notify(field_name)
+
     def place_hex(self, x=None, y=None):
         """Place a new hex marker at a random or specified world position."""
         if not self.client or not self.client.is_connected:
@@ -155,6 +353,9 @@ class SmartBotReal(SmartBotBase):
     def write(self, cmd: Command):
         """Publish the contents of :param:`cmd` to Ros2.
 
+        With ``init(command_rate=...)`` this only hands ``cmd`` to the
+        background sender and returns immediately.
+
         Args:
             cmd (:class:`smartbot_irl.Command`):
                 An instance of :class:`smartbot_irl.Command` which should
@@ -164,25 +365,93 @@ class SmartBotReal(SmartBotBase):
             print('Not connected to ROSBridge; cannot publish command.')
             return
 
-        assert self.cmd_vel_pub is not None  # TODO make a mapping for this and loop for asserts.
+        if self.command_sender is not None:
+            self.command_sender.submit(cmd)
+            return
+
+        publishers = self._command_publishers()
+        for ros_type, msg in cmd.to_ros().items():
+            publishers[ros_type](msg)
+
+    def _command_publishers(self) -> dict:
+        """Publish function per message type of :meth:`Command.to_ros`."""
+        assert self.cmd_vel_pub is not None
         assert self.manipulator_presets_pub is not None
         assert self.gripper_closed_pub is not None
+        return {
+            'geometry_msgs/Twist': lambda msg: self.cmd_vel_pub.publish(roslibpy.Message(msg)),
+            'std_msgs/String': lambda msg: self.manipulator_presets_pub.publish(roslibpy.Message(msg)),
+            'std_msgs/Bool': lambda msg: self.gripper_closed_pub.publish(roslibpy.Message(msg)),
+        }
 
-        msgs = cmd.to_ros()
+    # -----------------------------------------------------------------
+    def read(self) -> SensorSnapshot:
+        """Return a read-only snapshot of the most recently received sensor data.
 
-        if 'geometry_msgs/Twist' in msgs:
-            self.cmd_vel_pub.publish(roslibpy.Message(msgs['geometry_msgs/Twist']))
+        Every field comes from the same instant and stays put while you use
+        it. Calls with no new message in between return the same snapshot;
+        compare :attr:`SensorSnapshot.seq` to tell whether anything changed.
+        """
+        with self._data_lock:
+            snap = self._snapshot()
+            self._notifier.mark_seen()
+        return snap
 
-        if 'std_msgs/String' in msgs:
-            self.manipulator_presets_pub.publish(roslibpy.Message(msgs['std_msgs/String']))
+    def _snapshot(self) -> SensorSnapshot:
+        """Like :meth:`read`, but without marking anything as seen (for the drawer)."""
+        with self._data_lock:
+            snap = self._last_snapshot
+            if snap is None or snap.seq != self._seq:
+                snap = self._last_snapshot = SensorSnapshot(self.sensor_data, self._seq)
+        return snap
 
-        if 'std_msgs/Bool' in msgs:
-            self.gripper_closed_pub.publish(roslibpy.Message(msgs['std_msgs/Bool']))
+    def wait_for(self, topics=None, timeout: float | None = None) -> SensorSnapshot | None:
+        """Block until every topic in ``topics`` has a message not yet seen by :meth:`read`.
 
-    # -----------------------------------------------------------------
-    def read(self) -> SensorData:
-        """Return the most recently received sensor data."""
-        return self.sensor_data
+        Wakes as soon as the last of them arrives, without polling.
+
+        Args:
+            topics (str | list[str], optional): SensorData field names
+                (``'scan'``) or topic names (``'livox/imu'``). Default: all.
+            timeout (float, optional): Seconds to wait at most.
+
+        Returns:
+            The new :meth:`read` snapshot, or None on timeout.
+
+        Example::
+            while True:
+                data = bot.wait_for(['scan', 'odom'], timeout=0.5)
+                if data is None:
+                    logger.warning('No scan/odom for 0.5s')
+                    continue
+                bot.write(step(data))
+        """
+        return self._wait(topics, timeout, require_all=True)
+
+    def wait_any(self, topics=None, timeout: float | None = None) -> SensorSnapshot | None:
+        """Like :meth:`wait_for`, but return once any one of ``topics`` has new data."""
+        return self._wait(topics, timeout, require_all=False)
+
+    def _wait(self, topics, timeout: float | None, require_all: bool) -> SensorSnapshot | None:
+        fields = self._notifier.resolve(topics)
+        if not self._notifier.wait(fields, timeout, require_all):
+            return None
+        return self.read()
+
+    @property
+    def seq(self) -> int:
+        """Number of sensor messages received so far."""
+        return self._seq
+
+    def stats(self) -> dict[str, dict]:
+        """Count, age, rate, jitter and latency of every topic, keyed by SensorData field.
+
+        Example::
+            for field, s in bot.stats().items():
+                if s['age'] > 0.5:
+                    print(f"{field} is stale: last message {s['age']:.2f}s ago")
+        """
+        return {field: stats.summary() for field, stats in self.topic_stats.items()}
 
     # -----------------------------------------------------------------
     def spin(self, dt: float = 0.01) -> None:
@@ -198,13 +467,19 @@ class SmartBotReal(SmartBotBase):
         """Cleanly disconnect all topics, publishers, and client."""
         print('Shutting down SmartBotReal...')
 
+        # Send the last command still queued before the connection goes.
+        if self.command_sender is not None:
+            self.command_sender.close()
+            self.command_sender = None
+
         # Unsubscribe all topics.
         for topic in self._subscriptions:
             try:
-                topic.unsubscribe()
+                self._transport.unsubscribe(topic)
             except Exception as e:
                 print(f'Warning: failed to unsubscribe {topic.name}: {e}')
         self._subscriptions.clear()
+        self._topics.clear()
 
         # Stop publishers.
         for pub in [self.cmd_vel_pub, self.gripper_closed_pub]:
@@ -214,7 +489,9 @@ class SmartBotReal(SmartBotBase):
                 except Exception:
                     pass
 
-        # Close client connection.
+        # Close client connection (a shared one is closed by its owner).
+        if self.client and not self._owns_client:
+            self.client = None
         if self.client:
             try:
                 if self.client.is_connected:
@@ -225,6 +502,14 @@ class SmartBotReal(SmartBotBase):
             finally:
                 self.client = None
 
+        # Write out any recorded messages still queued.
+        if self.recorder:
+            recorder, self.recorder = self.recorder, None
+            try:
+                recorder.close()
+            except Exception as e:
+                logger.error(f'Some messages could not be recorded to {recorder.path}: {e}')
+
         # Shut down drawer if any.
         if self.drawer:
             try:
@@ -252,7 +537,7 @@ if __name__ == '__main__':
         while True:
             bot.write(cmd)
             data = bot.read()
-            print(data.__dict__.keys)
+            print(data)
             # print(f"Odom: x={data.pose_x:.2f}, y={data.pose_y:.2f}, θ={data.pose_theta:.2f}")
             bot.spin(0.5)
     except KeyboardInterrupt:
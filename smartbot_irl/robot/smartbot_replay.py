@@ -0,0 +1,135 @@
+# smartbot_replay.py
+import time
+from dataclasses import asdict, fields, replace
+from typing import Iterator, Optional
+
+import pandas as pd
+
+from .smartbot_base import SmartBotBase
+from .smartbot_real import TOPIC_MAP
+from ..data import Command, SensorData, SensorLog, TopicStats
+from ..drawing import Drawer
+from ..utils import SmartLogger
+import logging
+
+logger = SmartLogger(level=logging.INFO)  # Print statements, but better!
+
+
+class SmartBotReplay(SmartBotBase):
+    """
+    Play a sensor log recorded with ``SmartBotReal.init(record_path=...)``
+    back through the normal read/write/spin interface.
+
+    Messages are decoded exactly as :class:`SmartBotReal` decodes them and are
+    applied to :attr:`sensor_data` once the virtual clock passes their receive
+    time. Every :meth:`write` is captured in :attr:`commands` (stamped with the
+    virtual time) so runs of two ``step()`` versions can be diffed with
+    :meth:`commands_frame`.
+    """
+
+    def __init__(self, drawing=False, smartbot_num=0, draw_region=((-5, 5), (-5, 5))):
+        super().__init__(drawing=drawing, draw_region=draw_region)
+        self.smartbot_num = smartbot_num
+        self.sensor_data = SensorData()
+        self.drawer = Drawer(lambda: self.sensor_data, region=draw_region) if drawing else None
+        self._running = False
+        self._topic_map = dict(TOPIC_MAP)
+        self.topic_stats: dict[str, TopicStats] = {field: TopicStats() for _, field in self._topic_map.values()}
+
+        self.log: SensorLog | None = None
+        self.speed: Optional[float] = None
+        self.now = 0.0  # Virtual clock, in log (receive) time.
+        self.commands: list[tuple[float, Command]] = []
+
+        self._messages: Iterator[tuple[float, str, dict]] = iter(())
+        self._next: tuple[float, str, dict] | None = None
+        self._wall0 = 0.0
+        self._log0 = 0.0
+
+    def init(self, log_path: str, speed: Optional[float] = None, start=None, stop=None) -> None:
+        """Open a recorded sensor log.
+
+        Args:
+            log_path (str):
+                Log written by ``SmartBotReal.init(record_path=...)``.
+
+            speed (float, optional):
+                Playback speed. ``1.0`` follows the wall clock, ``N`` runs N
+                times faster than real time. The default ``None`` plays as fast
+                as possible: each ``spin(dt)`` advances the virtual clock by
+                exactly ``dt``, which makes runs repeatable.
+
+            start (float, optional):
+                Seconds into the log to start from.
+
+            stop (float, optional):
+                Seconds into the log to stop at.
+        """
+        self.log = SensorLog(log_path)
+        self.speed = speed
+        t0 = self.log.start_time
+        self._log0 = t0 if start is None else t0 + start
+        self.now = self._log0
+        self._wall0 = time.monotonic()
+        self._messages = self.log.read(
+            start=self._log0,
+            stop=None if stop is None else t0 + stop,
+            topics=[name for name in self.log.topics if name in self._topic_map],
+        )
+        self._next = next(self._messages, None)
+        self.commands.clear()
+        self._running = True
+        logger.info(f'Replaying {len(self.log)} messages from {log_path}')
+
+        # Apply whatever arrived at the very start so the first read() has data.
+        self._advance(self.now)
+
+    @property
+    def finished(self) -> bool:
+        """True once every message in the log has been played."""
+        return self._next is None
+
+    def write(self, cmd: Command):
+        """Capture ``cmd`` instead of publishing it."""
+        self.commands.append((self.now, replace(cmd)))
+
+    def read(self) -> SensorData:
+        """Return the sensor data as of the virtual clock."""
+        return self.sensor_data
+
+    def spin(self, dt: float = 0.01) -> None:
+        """Advance the virtual clock and apply every message received up to it."""
+        if self.speed is None:
+            now = self.now + dt
+        else:
+            now = self._log0 + (time.monotonic() - self._wall0) * self.speed
+        self._advance(now)
+        if self.drawer and self.drawer._running:
+            self.drawer.draw_once(dt)
+
+    def commands_frame(self) -> pd.DataFrame:
+        """Captured commands as a DataFrame: one row per write(), ``t`` in seconds into the log."""
+        names = [f.name for f in fields(Command)]
+        rows = [{'t': t - self.log.start_time, **asdict(cmd)} for t, cmd in self.commands]
+        return pd.DataFrame(rows, columns=['t', *names])
+
+    def shutdown(self):
+        self._running = False
+        self._messages = iter(())
+        self._next = None
+        if self.drawer:
+            self.drawer.quit()
+
+    # -----------------------------------------------------------------
+    def _advance(self, now: float) -> None:
+        self.now = now
+        while self._next is not None and self._next[0] <= now:
+            t, name, msg = self._next
+            cls, field_name = self._topic_map[name]
+            setattr(self.sensor_data, field_name, cls.from_ros(msg))
+            # Stamped with the recorded receive time; pass now=bot.now to ages.
+            self.sensor_data.stamps[field_name] = self.topic_stats[field_name].record(msg, t)
+            self._next = next(self._messages, None)
+        if self._next is None and self._running:
+            logger.info('Reached the end of the sensor log.')
+            self._running = False
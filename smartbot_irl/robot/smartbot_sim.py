@@ -1,8 +1,10 @@
 # smartbot_sim.py
+from .data_notifier import DataNotifier
 from .smartbot_base import SmartBotBase
 import pygame
 import time
 import math
+import numpy as np
 from ..data import JointState, SensorData, Command
 from ..drawing import Drawer
 from ..sim2d.engine import SimEngine
@@ -25,6 +27,7 @@ class SmartBotSim(SmartBotBase):
         self.sensor_data = self.engine.read_all()  # start with engine’s data
         self.drawer = Drawer(lambda: self.sensor_data, region=draw_region) if drawing else None
         self._running = False
+        self._notifier = DataNotifier(vars(self.sensor_data))  # Every field updates on each spin().
 
     def init(self, **kwargs):
         logger.info(msg='Connecting to smartbot...')
@@ -49,7 +52,7 @@ class SmartBotSim(SmartBotBase):
         scan.angle_max = math.pi
         scan.angle_increment = math.radians(5.0)
         num_rays = int((scan.angle_max - scan.angle_min) / scan.angle_increment)
-        scan.ranges = [float('inf')] * num_rays
+        scan.ranges = np.full(num_rays, np.inf, dtype=np.float32)  # Same type as on the robot.
 
         print('SmartBotSim initialized')
 
@@ -61,12 +64,44 @@ class SmartBotSim(SmartBotBase):
 
     def read(self) -> SensorData:
         # Get sensor data from sim.
-        self.sensor_data = self.engine.read_all()
+        with self._notifier.cond:
+            self.sensor_data = self.engine.read_all()
+            self._notifier.mark_seen()
         return self.sensor_data
 
+    def wait_for(self, topics=None, timeout: float | None = None, dt: float | None = 0.05) -> SensorData | None:
+        """Block until every topic in ``topics`` has data not yet seen by :meth:`read`.
+
+        Same as :meth:`SmartBotReal.wait_for`. The simulation only advances in
+        :meth:`spin`, so if nothing is fresh this calls ``spin(dt)`` itself.
+        With ``dt=None`` it instead waits for another thread to spin.
+
+        Returns:
+            The new :meth:`read` data, or None on timeout.
+        """
+        return self._wait(topics, timeout, dt, require_all=True)
+
+    def wait_any(self, topics=None, timeout: float | None = None, dt: float | None = 0.05) -> SensorData | None:
+        """Like :meth:`wait_for`, but return once any one of ``topics`` has new data."""
+        return self._wait(topics, timeout, dt, require_all=False)
+
+    def _wait(self, topics, timeout, dt, require_all: bool) -> SensorData | None:
+        notifier = self._notifier
+        fields = notifier.resolve(topics)
+        if dt is not None:
+            with notifier.cond:
+                ready = notifier.ready(fields, require_all)
+            if not ready:
+                self.spin(dt)
+        if not notifier.wait(fields, timeout, require_all):
+            return None
+        return self.read()
+
     def spin(self, dt: float = 0.05):
         self.engine.step(dt)
-        self.read()  # Update sensor data.
+        with self._notifier.cond:  # Update sensor data.
+            self.sensor_data = self.engine.read_all()
+            self._notifier.notify(*self._notifier.counts)
         if self.drawer and self.drawer._running:
             self.drawer.draw_once(dt)
         # time.sleep(dt)
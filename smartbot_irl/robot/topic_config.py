@@ -0,0 +1,85 @@
+# topic_config.py
+"""
+Per-topic subscription settings for :class:`SmartBotReal`.
+
+A YAML file passed as ``SmartBotReal.init(yaml_path=...)`` may hold a
+``topics`` section keyed by topic name (without the ``/smartbot<N>`` prefix)::
+
+    topics:
+      scan:
+        throttle_rate: 100   # At most one scan per 100 ms from rosbridge.
+        queue_length: 1      # Drop stale scans instead of queueing them.
+        compression: cbor    # Binary frames, ranges arrive as float32 arrays.
+      livox/imu:
+        decimate: 4          # Keep every 4th IMU message.
+      seen_robots:
+        enabled: false       # Do not subscribe at all.
+
+Other top-level keys are ignored, and so is a path that does not exist
+(with a warning).
+"""
+
+from dataclasses import dataclass, fields, replace
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from .transport import COMPRESSIONS
+
+
+@dataclass
+class TopicConfig:
+    """
+    Subscription settings for one topic.
+
+    Attributes:
+        enabled (bool): Subscribe to the topic at all.
+        throttle_rate (int): Minimum time between messages in ms, enforced by
+            rosbridge before anything is sent over the network. 0 = no limit.
+        queue_length (int): Messages rosbridge may queue for us while
+            throttling. 0 = rosbridge default.
+        decimate (int): Keep only every Nth message that does arrive
+            (client side, before decoding). Stats and the recorder still see
+            every message.
+        compression (str): rosbridge encoding of the messages: ``'none'``
+            (JSON), ``'png'``, ``'cbor'`` or ``'cbor-raw'`` (see
+            :mod:`smartbot_irl.robot.transport`). Binary encodings pay off for
+            large array topics such as ``scan``.
+    """
+
+    enabled: bool = True
+    throttle_rate: int = 0
+    queue_length: int = 0
+    decimate: int = 1
+    compression: str = 'none'
+
+    def __post_init__(self):
+        if int(self.decimate) < 1:
+            raise ValueError(f'decimate must be >= 1, got {self.decimate}')
+        if int(self.throttle_rate) < 0 or int(self.queue_length) < 0:
+            raise ValueError('throttle_rate and queue_length must be >= 0')
+        if self.compression not in COMPRESSIONS:
+            raise ValueError(f'compression must be one of {COMPRESSIONS}, got {self.compression!r}')
+
+    def updated(self, settings: 'TopicConfig | dict[str, Any]') -> 'TopicConfig':
+        """Return a copy with ``settings`` (a dict of changes or another config) applied."""
+        if isinstance(settings, TopicConfig):
+            return replace(settings)
+        unknown = set(settings) - {f.name for f in fields(self)}
+        if unknown:
+            raise TypeError(f'Unknown topic settings: {sorted(unknown)}')
+        return replace(self, **settings)
+
+
+def load_topic_config(path: str | Path) -> dict[str, dict[str, Any]]:
+    """Read the ``topics`` section of a YAML file (an empty dict if it has none or is missing)."""
+    if not Path(path).is_file():
+        print(f'Warning: topic config {path} not found; using default topic settings')
+        return {}
+    with open(path, 'r') as f:
+        cfg = yaml.safe_load(f) or {}
+    topics = cfg.get('topics') or {}
+    if not isinstance(topics, dict):
+        raise ValueError(f"'topics' in {path} must be a mapping of topic name to settings")
+    return {str(name): dict(settings or {}) for name, settings in topics.items()}
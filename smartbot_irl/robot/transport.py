@@ -0,0 +1,252 @@
+# transport.py
+"""
+rosbridge ``compression`` support for roslibpy connections.
+
+roslibpy only understands JSON text frames. :class:`BinaryTransport` patches
+each protocol instance of a :class:`roslibpy.Ros` client (including the ones
+created on reconnect) so that it also accepts what rosbridge sends for the
+other ``compression`` modes of a subscription:
+
+``png``
+    A JSON frame ``{"op": "png", "data": <base64 PNG>}`` whose pixels hold the
+    real JSON message. Unpacked with pygame's PNG decoder.
+
+``cbor``
+    A binary CBOR frame. Numeric arrays arrive as CBOR typed arrays (RFC 8746)
+    and become NumPy arrays that share the frame's buffer, e.g. ``float32[]``
+    ranges are never turned into a list of Python floats.
+
+``cbor-raw``
+    A binary CBOR frame carrying the serialized ROS 2 message (CDR) instead of
+    a dict. Only types with a parser in :data:`CDR_PARSERS` (LaserScan and
+    JointState) can use it; they are turned back into the usual rosbridge dict,
+    with NumPy arrays.
+
+Either way subscription callbacks receive ordinary rosbridge dicts, so the
+recorder and the message decoders need no changes. CBOR needs the optional
+``cbor2`` package.
+"""
+
+import base64
+import io
+import json
+import struct
+from typing import Any, Callable
+
+import numpy as np
+import roslibpy
+
+COMPRESSIONS = ('none', 'png', 'cbor', 'cbor-raw')
+
+# RFC 8746 typed-array tags used by rosbridge (little endian).
+_TYPED_ARRAYS = {
+    64: np.uint8,
+    69: np.dtype('<u2'),
+    70: np.dtype('<u4'),
+    71: np.dtype('<u8'),
+    72: np.int8,
+    77: np.dtype('<i2'),
+    78: np.dtype('<i4'),
+    79: np.dtype('<i8'),
+    85: np.dtype('<f4'),
+    86: np.dtype('<f8'),
+}
+
+
+def _tag_hook(*args):
+    # cbor2 < 6 calls tag_hook(decoder, tag), cbor2 >= 6 calls tag_hook(tag, immutable).
+    import cbor2
+
+    tag = args[0] if isinstance(args[0], cbor2.CBORTag) else args[1]
+    dtype = _TYPED_ARRAYS.get(tag.tag)
+    if dtype is None:
+        return tag
+    return np.frombuffer(tag.value, dtype=dtype)
+
+
+def decode_cbor(payload: bytes) -> dict:
+    """Decode one binary rosbridge frame, typed arrays as NumPy arrays."""
+    try:
+        import cbor2
+    except ImportError:
+        raise ImportError(
+            "rosbridge 'cbor' compression needs the cbor2 package (pip install cbor2)"
+        ) from None
+    return cbor2.loads(payload, tag_hook=_tag_hook)
+
+
+def decode_png(data: str | bytes) -> dict:
+    """Unpack a rosbridge ``png`` op back into the JSON message it wraps."""
+    import pygame
+
+    surface = pygame.image.load(io.BytesIO(base64.b64decode(data)), 'msg.png')
+    raw = pygame.image.tobytes(surface, 'RGB')
+    return json.loads(raw.rstrip(b'\n'))
+
+
+# --------------------------------------------------------------
+# CDR (ROS 2 wire format) parsers for cbor-raw.
+class _CdrReader:
+    """Little-endian CDR reader. Alignment is relative to the 4-byte encapsulation header."""
+
+    def __init__(self, data: bytes):
+        self.data = memoryview(data)
+        if bytes(self.data[:2]) not in (b'\x00\x01', b'\x00\x03'):
+            raise ValueError('Only little-endian CDR messages are supported')
+        self.pos = 4
+
+    def _align(self, n: int) -> None:
+        self.pos += -(self.pos - 4) % n
+
+    def unpack(self, fmt: struct.Struct) -> tuple:
+        self._align(fmt.size if fmt.size in (2, 4, 8) else 4)
+        values = fmt.unpack_from(self.data, self.pos)
+        self.pos += fmt.size
+        return values
+
+    def uint32(self) -> int:
+        return self.unpack(_U32)[0]
+
+    def string(self) -> str:
+        n = self.uint32()
+        s = bytes(self.data[self.pos : self.pos + n - 1]).decode()
+        self.pos += n
+        return s
+
+    def array(self, dtype: np.dtype) -> np.ndarray:
+        n = self.uint32()
+        self._align(dtype.itemsize)
+        out = np.frombuffer(self.data, dtype=dtype, count=n, offset=self.pos)
+        self.pos += n * dtype.itemsize
+        return out
+
+    def header(self) -> dict:
+        sec, nanosec = self.unpack(_STAMP)
+        return {'stamp': {'sec': sec, 'nanosec': nanosec}, 'frame_id': self.string()}
+
+
+_U32 = struct.Struct('<I')
+_STAMP = struct.Struct('<iI')
+_SCAN_INFO = struct.Struct('<7f')
+_F32 = np.dtype('<f4')
+_F64 = np.dtype('<f8')
+
+
+def _laserscan_cdr(data: bytes) -> dict:
+    r = _CdrReader(data)
+    header = r.header()
+    info = r.unpack(_SCAN_INFO)
+    keys = ('angle_min', 'angle_max', 'angle_increment', 'time_increment', 'scan_time', 'range_min', 'range_max')
+    msg = {'header': header, **dict(zip(keys, info))}
+    msg['ranges'] = r.array(_F32)
+    msg['intensities'] = r.array(_F32)
+    return msg
+
+
+def _jointstate_cdr(data: bytes) -> dict:
+    r = _CdrReader(data)
+    header = r.header()
+    names = [r.string() for _ in range(r.uint32())]
+    return {
+        'header': header,
+        'name': names,
+        'position': r.array(_F64),
+        'velocity': r.array(_F64),
+        'effort': r.array(_F64),
+    }
+
+
+CDR_PARSERS: dict[str, Callable[[bytes], dict]] = {
+    'sensor_msgs/LaserScan': _laserscan_cdr,
+    'sensor_msgs/msg/LaserScan': _laserscan_cdr,
+    'sensor_msgs/JointState': _jointstate_cdr,
+    'sensor_msgs/msg/JointState': _jointstate_cdr,
+}
+
+
+# --------------------------------------------------------------
+def _roslibpy_attr(obj: Any, name: str) -> Any:
+    """
+    Read a private attribute of roslibpy (``factory._proto``,
+    ``proto._message_handlers``). Everything here that reaches into roslibpy
+    goes through this, so a roslibpy release that renames them fails with a
+    clear error instead of an AttributeError deep inside a callback.
+    """
+    try:
+        return getattr(obj, name)
+    except AttributeError:
+        raise RuntimeError(
+            f'{type(obj).__name__}.{name} not found: this roslibpy version '
+            f'({getattr(roslibpy, "__version__", "unknown")}) is not supported by smartbot_irl'
+        ) from None
+
+
+class BinaryTransport:
+    """
+    Teach a :class:`roslibpy.Ros` client the ``png``, ``cbor`` and ``cbor-raw``
+    rosbridge encodings.
+
+    Args:
+        ros (roslibpy.Ros): Client to patch. Call before or after connecting.
+
+    Example::
+        client = roslibpy.Ros(host, port)
+        transport = BinaryTransport(client)
+        client.run()
+        transport.subscribe(topic, callback, compression='cbor')
+    """
+
+    def __init__(self, ros: roslibpy.Ros):
+        self.ros = ros
+        self.raw_types: dict[str, str] = {}  # topic name -> ROS type, for cbor-raw
+        ros.factory.on('ready', self._patch)
+        proto = _roslibpy_attr(ros.factory, '_proto')
+        if proto is not None:
+            self._patch(proto)
+
+    def subscribe(self, topic: roslibpy.Topic, callback, compression: str = 'none') -> None:
+        """Subscribe ``topic`` with rosbridge ``compression`` (one of :data:`COMPRESSIONS`)."""
+        if compression not in COMPRESSIONS:
+            raise ValueError(f'Unknown compression {compression!r}; use one of {COMPRESSIONS}')
+        # roslibpy refuses anything but png/none in Topic(), but sends whatever is set.
+        topic.compression = compression
+        if compression == 'cbor-raw':
+            if topic.message_type not in CDR_PARSERS:
+                raise ValueError(f"No CDR parser for {topic.message_type}; use 'cbor' for {topic.name}")
+            self.raw_types[topic.name] = topic.message_type
+        topic.subscribe(callback)
+
+    def unsubscribe(self, topic: roslibpy.Topic) -> None:
+        """Undo :meth:`subscribe`."""
+        self.raw_types.pop(topic.name, None)
+        topic.unsubscribe()
+
+    # --------------------------------------------------------------
+    def _patch(self, proto) -> None:
+        if getattr(proto, '_smartbot_binary', False):
+            return
+        proto._smartbot_binary = True
+        on_text = proto.onMessage
+
+        def on_message(payload, is_binary):
+            if not is_binary:
+                return on_text(payload, is_binary)
+            try:
+                self._dispatch(proto, decode_cbor(payload))
+            except Exception as e:
+                print(f'Warning: dropped binary rosbridge message: {e}')
+
+        proto.onMessage = on_message
+        handlers = _roslibpy_attr(proto, '_message_handlers')
+        if 'png' not in handlers:
+            handlers['png'] = lambda message: self._dispatch(proto, decode_png(message['data']))
+
+    def _dispatch(self, proto, message: dict[str, Any]) -> None:
+        if message.get('op') == 'publish':
+            msg = message.get('msg')
+            parse = CDR_PARSERS.get(self.raw_types.get(message.get('topic')))
+            if parse is not None and isinstance(msg, dict) and 'bytes' in msg:
+                message['msg'] = parse(msg['bytes'])
+        handler = _roslibpy_attr(proto, '_message_handlers').get(message.get('op'))
+        if handler is not None:
+            handler(roslibpy.Message(message))
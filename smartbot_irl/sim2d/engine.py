@@ -1,5 +1,6 @@
 # engine.py
 import math
+import numpy as np
 import time
 from dataclasses import dataclass
 from ..data import Command, SensorData
@@ -244,20 +245,16 @@ class SimEngine:
 
     def _update_markers(self):
         """Compute marker poses relative to the robot body frame."""
-        from ..data import Pose, PoseArray, ArucoMarkers
+        from ..data import ArucoMarkers
 
         s = self.state
         rx, ry, rtheta = s.odom.x, s.odom.y, s.odom.yaw
 
-        rel_poses = []
-        for mx, my in self.markers:
-            dx = mx - rx
-            dy = my - ry
-            # Transform from world to robot frame
-            rel_x = math.cos(-rtheta) * dx - math.sin(-rtheta) * dy
-            rel_y = math.sin(-rtheta) * dx + math.cos(-rtheta) * dy
-            rel_poses.append(Pose(x=rel_x, y=rel_y, z=0.0))
-        s.seen_hexes = ArucoMarkers(poses=rel_poses, marker_ids=[48] * len(rel_poses))
+        # Transform from world to robot frame: rotate by -theta.
+        d = np.asarray(self.markers, dtype=float).reshape(-1, 2) - (rx, ry)
+        c, sn = math.cos(rtheta), math.sin(rtheta)
+        rel = d @ np.array([[c, -sn], [sn, c]])
+        s.seen_hexes = ArucoMarkers.from_xy(rel, marker_ids=np.full(len(rel), 48))
 
     def read_all(self):
         return self.state
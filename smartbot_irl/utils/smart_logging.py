@@ -128,6 +128,8 @@ class SmartLogger:
     def warn(self, msg: Any, rate: float = 0.0):
         self.log(msg, rate=rate, level=logging.WARNING)
 
+    warning = warn  # Same name as logging.Logger.
+
     def error(self, msg: Any, rate: float = 0.0):
         self.log(msg, rate=rate, level=logging.ERROR)
 